@@ -83,6 +83,8 @@ class Building(Tile):
     that the player must protect from enemies.
     """
     _building_health = None
+    # The board this building is on, told whenever its health changes
+    _board = None
 
     def __init__(self, initial_health: int) -> None:
         """
@@ -96,7 +98,8 @@ class Building(Tile):
         self._building_health = max(0, min(initial_health, MAX_BUILDING_HEALTH))
         # self._id = str(self._building_health)
         self._name = BUILDING_NAME
-        self._blocking = True
+        # destroyed buildings do not block
+        self._blocking = self._building_health > 0
 
         super().__init__()
 
@@ -104,11 +107,7 @@ class Building(Tile):
         """
         Returns True only when the building is destroyed.
         """
-        if self._building_health:
-            return False
-        else:
-            self._blocking = False
-            return True
+        return not self._building_health
     
     def damage(self, damage: int) -> None:
         """
@@ -118,6 +117,7 @@ class Building(Tile):
         Parameter:
             damage: amount of damage of a building about to receive.
         """
+        old_health = self._building_health
         if not self.is_destroyed():
             if damage >= 0:
                 self._building_health = max(0, self._building_health - damage)
@@ -128,7 +128,24 @@ class Building(Tile):
         else:
             self._building_health = self._building_health
 
-        
+        if self.is_destroyed():
+            self._blocking = False
+        if self._board is not None and self._building_health != old_health:
+            self._board._building_damaged(self, old_health)
+
+    def _set_health(self, health: int) -> None:
+        """
+        Sets the health of the building directly, even if it is destroyed. 
+        Used to undo damage.
+
+        Parameter:
+            health: the health to restore.
+        """
+        old_health = self._building_health
+        self._building_health = health
+        self._blocking = health > 0
+        if self._board is not None and health != old_health:
+            self._board._building_damaged(self, old_health)
 
     def __repr__(self) -> str:
         """
@@ -147,6 +164,8 @@ class Board():
     A board organizes tiles in a rectangular grid, 
     where each tile has an associated (row, column) position.
     """
+    # The model using this board, told whenever a building's health changes
+    _model = None
 
     def __init__(self, board: list[list[str]]) -> None:
         """
@@ -179,6 +198,8 @@ class Board():
                     building_inst = Building(int(tile_symbol))
                     board_row.append(building_inst)
             self._game_board.append(board_row)
+
+        self._index_buildings()
                     
     
     def get_dimensions(self) -> tuple[int, int]:
@@ -201,17 +222,81 @@ class Board():
         
         
     
-    def get_buildings(self)-> dict[tuple[int, int], Building]:
+    def _find_buildings(self) -> dict[tuple[int, int], Building]:
         """
-        Returns a dictionary mapping the positions of buildings 
-        to the building instances at those positions.
+        Scans the board and returns a dictionary mapping the positions of 
+        buildings to the building instances at those positions.
         """
+        buildings = {}
         for row_index, row in enumerate(self._game_board):
             for col_index, tile_inst in enumerate(row):
                 if isinstance(tile_inst, Building):
-                    self._buildings_dict[(row_index, col_index)] = tile_inst
+                    buildings[(row_index, col_index)] = tile_inst
+        return buildings
+
+    def _index_buildings(self) -> None:
+        """
+        Builds the building registry: the building positions, the number of 
+        buildings still standing, and the building positions grouped by 
+        health. The registry is then kept up to date by Building.damage.
+        """
+        self._buildings_dict = self._find_buildings()
+        self._building_positions = {}
+        self._standing_buildings = 0
+        self._health_groups = [set() for _ in range(MAX_BUILDING_HEALTH + 1)]
+        # highest position in each health group, filled in when asked for
+        self._health_group_max = {}
+        for position, building in self._buildings_dict.items():
+            building._board = self
+            self._building_positions[building] = position
+            self._health_groups[int(str(building))].add(position)
+            if not building.is_destroyed():
+                self._standing_buildings += 1
+
+    def _building_damaged(self, building: Building, old_health: int) -> None:
+        """
+        Updates the building registry after the health of a building changed.
+        Called by Building.damage.
+        """
+        position = self._building_positions[building]
+        new_health = int(str(building))
+        self._health_groups[old_health].discard(position)
+        self._health_groups[new_health].add(position)
+        self._health_group_max.pop(old_health, None)
+        self._health_group_max.pop(new_health, None)
+        if old_health and not new_health:
+            self._standing_buildings -= 1
+        elif new_health and not old_health:
+            self._standing_buildings += 1
+        if self._model is not None:
+            self._model._building_damaged(position, old_health)
 
+    def get_buildings(self)-> dict[tuple[int, int], Building]:
+        """
+        Returns a dictionary mapping the positions of buildings 
+        to the building instances at those positions.
+        """
         return self._buildings_dict
+
+    def get_standing_building_count(self) -> int:
+        """
+        Returns the number of buildings that are not destroyed.
+        """
+        return self._standing_buildings
+
+    def get_lowest_health_building(self) -> Optional[tuple[int, int]]:
+        """
+        Returns the position of the building with the lowest health, 
+        counting destroyed buildings as having 0 health. 
+        Ties are broken by the highest (row, col) position.
+        Returns None if the board has no buildings.
+        """
+        for health, positions in enumerate(self._health_groups):
+            if positions:
+                if health not in self._health_group_max:
+                    self._health_group_max[health] = max(positions)
+                return self._health_group_max[health]
+        return None
     
     def __repr__(self) -> str:
         """
@@ -241,7 +326,347 @@ class Board():
 
         return _concat_str
     
+class BuildingView(Building):
+    """
+    Inherits from class Building.
+    A BuildingView is a building tile whose health and blocking state live 
+    in the arrays of a CompactBoard rather than on the tile itself, 
+    so it behaves like a Building while reading and writing the board.
+    """
+    _name = BUILDING_NAME
+
+    def __init__(self, board: "CompactBoard", index: int) -> None:
+        """
+        Creates a view onto the building stored at the given index.
+
+        Parameters:
+            board: the compact board that stores the building.
+            index: flat (row * #columns + column) index of the building.
+        """
+        self._board = board
+        self._index = index
+
+    @property
+    def _building_health(self) -> int:
+        return self._board._health[self._index]
+
+    @_building_health.setter
+    def _building_health(self, health: int) -> None:
+        if self._board._shared:
+            self._board._own_arrays()
+        self._board._health[self._index] = health
+
+    @property
+    def _blocking(self) -> bool:
+        return bool(self._board._blocking[self._index])
+
+    @_blocking.setter
+    def _blocking(self, blocking: bool) -> None:
+        if self._board._shared:
+            self._board._own_arrays()
+        self._board._blocking[self._index] = int(blocking)
+
+    def __repr__(self) -> str:
+        """
+        Returns a machine readable string that could be used 
+        to construct an identical instance of the tile.
+        """
+        return f"{Building.__name__}({str(self._building_health)})"
+
+
+# Tile kinds stored by CompactBoard
+GROUND_KIND = 0
+MOUNTAIN_KIND = 1
+BUILDING_KIND = 2
+
+
+class CompactBoard(Board):
+    """
+    Inherits from class Board.
+    CompactBoard stores the kind of every tile in a flat bytearray, in 
+    row-major order, with building health and blocking state held in 
+    parallel bytearrays. Tiles are only created when get_tile asks for them, 
+    so large boards do not need one Python object per position.
+    """
+    # bytes.translate tables from tile symbols to kinds and building health
+    _KIND_TABLE = bytes(
+        GROUND_KIND if chr(code) == GROUND_SYMBOL
+        else MOUNTAIN_KIND if chr(code) == MOUNTAIN_SYMBOL
+        else BUILDING_KIND if chr(code) in '0123456789'
+        else 255
+        for code in range(256))
+    _HEALTH_TABLE = bytes(
+        min(int(chr(code)), MAX_BUILDING_HEALTH) if chr(code) in '0123456789'
+        else 0
+        for code in range(256))
+    # mountains and buildings that are not destroyed block
+    _BLOCKING_TABLE = bytes(
+        int(chr(code) == MOUNTAIN_SYMBOL or chr(code) in '123456789')
+        for code in range(256))
+    _SYMBOL_TABLE = bytes(
+        ord(GROUND_SYMBOL) if kind == GROUND_KIND
+        else ord(MOUNTAIN_SYMBOL) if kind == MOUNTAIN_KIND
+        else 0
+        for kind in range(256))
+
+    def __init__(self, board: list[list[str]]) -> None:
+        """
+        Set up a new CompactBoard instance. Each list in board represents 
+        a row of the board, from top to bottom.
+
+        Parameters:
+            board: list of list of string representing all instances.
+        """
+        self._rows = 0
+        self._cols = 0
+        self._tiles = bytearray()
+        self._health = bytearray()
+        self._blocking = bytearray()
+        # whether the arrays are shared with a fork, see fork
+        self._shared = False
+        self._tile_views = {}
+        self._buildings_dict = None
+        self._building_positions = {}
+        self._ground = Ground()
+        self._mountain = Mountain()
+
+        for row in board:
+            self.add_row(''.join(row))
+
+    @classmethod
+    def from_arrays(cls, 
+                    dimensions: tuple[int, int], 
+                    tiles: bytes, 
+                    health: bytes) -> "CompactBoard":
+        """
+        Returns a board built straight from a tile kind array and a health 
+        array, as returned by get_tile_array and get_health_array.
+
+        Parameters:
+            dimensions: (#rows, #columns) of the board.
+            tiles: the kind of every tile in row-major order.
+            health: the health of every tile in row-major order.
+
+        Raises:
+            ValueError: if the arrays do not describe a valid board.
+        """
+        rows, cols = dimensions
+        if len(tiles) != rows * cols or len(health) != rows * cols:
+            raise ValueError(f"arrays do not match dimensions {dimensions}")
+        if tiles.translate(None, bytes([GROUND_KIND, MOUNTAIN_KIND, 
+                                        BUILDING_KIND])):
+            raise ValueError("unknown tile kind")
+        if max(health, default=0) > MAX_BUILDING_HEALTH:
+            raise ValueError("building health is too high")
+
+        board = cls([])
+        board._rows, board._cols = rows, cols
+        board._tiles = bytearray(tiles)
+        board._health = bytearray(health)
+        # every mountain and building blocks, apart from destroyed buildings
+        board._blocking = board._tiles.translate(bytes(
+            int(kind != GROUND_KIND) for kind in range(256)))
+        index = board._tiles.find(BUILDING_KIND)
+        while index != -1:
+            if not board._health[index]:
+                board._blocking[index] = 0
+            index = board._tiles.find(BUILDING_KIND, index + 1)
+        return board
+
+    def add_row(self, row: str) -> None:
+        """
+        Appends a row of tile symbols to the bottom of the board.
+
+        Parameters:
+            row: one tile symbol per column, from left to right.
+
+        Raises:
+            ValueError: if the row contains an unknown tile symbol, or its 
+                        length differs from the rows already on the board.
+        """
+        if self._rows and len(row) != self._cols:
+            raise ValueError(f"expected {self._cols} tiles in row "
+                             f"{self._rows} but found {len(row)}")
+        symbols = row.encode('latin-1', 'replace')
+        kinds = symbols.translate(self._KIND_TABLE)
+        if 255 in kinds:
+            raise ValueError(f"unknown tile symbol "
+                             f"{row[kinds.index(255)]!r} in row {self._rows}")
+
+        if self._shared:
+            self._own_arrays()
+            self._tiles = bytearray(self._tiles)
+        self._tiles += kinds
+        self._health += symbols.translate(self._HEALTH_TABLE)
+        self._blocking += symbols.translate(self._BLOCKING_TABLE)
+        self._cols = len(row)
+        self._rows += 1
+        self._buildings_dict = None
+
+    def fork(self) -> "CompactBoard":
+        """
+        Returns a board with the same tiles that shares this board's arrays 
+        instead of copying them. Whichever board next changes a building 
+        copies the health and blocking arrays first, so neither board ever 
+        sees the other's changes. Tile kinds never change, so the tile 
+        array stays shared.
+        """
+        board = CompactBoard([])
+        board._rows, board._cols = self._rows, self._cols
+        board._tiles = self._tiles
+        board._health = self._health
+        board._blocking = self._blocking
+        board._shared = self._shared = True
+        return board
+
+    def _own_arrays(self) -> None:
+        """
+        Replaces the health and blocking arrays shared with a fork by 
+        private copies, so they can be changed.
+        """
+        self._health = bytearray(self._health)
+        self._blocking = bytearray(self._blocking)
+        self._shared = False
+
+    def get_dimensions(self) -> tuple[int, int]:
+        """
+        Return the (#rows, #columns) dimensions of the board.
+        """
+        return (self._rows, self._cols)
+
+    def _get_index(self, position: tuple[int, int]) -> int:
+        """
+        Returns the flat index of the given position, supporting negative 
+        indices in the same way as nested lists.
+        """
+        row, col = position
+        if row < 0:
+            row += self._rows
+        if col < 0:
+            col += self._cols
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            raise IndexError(f"position {position} is not on the board")
+        return row * self._cols + col
+
+    def get_tile(self, position: tuple[int, int]) -> Tile:
+        """
+        Returns the Tile instance located at the given position.
+        Buildings are returned as views onto the board's arrays, and 
+        the same view is returned every time for a given position.
+
+        Parameters:
+            position: a tuple storing row and col index.
+        """
+        index = self._get_index(position)
+        kind = self._tiles[index]
+        if kind == GROUND_KIND:
+            return self._ground
+        if kind == MOUNTAIN_KIND:
+            return self._mountain
+        if self._buildings_dict is None:
+            # indexing the buildings creates every view, so the registry 
+            # exists before any building can be damaged
+            self._index_buildings()
+        return self._tile_views[index]
+
+    def _find_buildings(self) -> dict[tuple[int, int], Building]:
+        """
+        Scans the tile array and returns a dictionary mapping the positions 
+        of buildings to the building views at those positions.
+        """
+        buildings = {}
+        index = self._tiles.find(BUILDING_KIND)
+        while index != -1:
+            building = self._tile_views.get(index)
+            if building is None:
+                building = BuildingView(self, index)
+                self._tile_views[index] = building
+            buildings[divmod(index, self._cols)] = building
+            index = self._tiles.find(BUILDING_KIND, index + 1)
+        return buildings
+
+    def get_buildings(self) -> dict[tuple[int, int], Building]:
+        """
+        Returns a dictionary mapping the positions of buildings 
+        to the building views at those positions.
+        """
+        if self._buildings_dict is None:
+            self._index_buildings()
+        return self._buildings_dict
+
+    def get_standing_building_count(self) -> int:
+        """
+        Returns the number of buildings that are not destroyed.
+        """
+        self.get_buildings()
+        return super().get_standing_building_count()
+
+    def get_lowest_health_building(self) -> Optional[tuple[int, int]]:
+        """
+        Returns the position of the building with the lowest health, 
+        counting destroyed buildings as having 0 health. 
+        Ties are broken by the highest (row, col) position.
+        Returns None if the board has no buildings.
+        """
+        self.get_buildings()
+        return super().get_lowest_health_building()
+
+    def get_tile_array(self) -> bytearray:
+        """
+        Returns the kind of every tile (GROUND_KIND, MOUNTAIN_KIND or 
+        BUILDING_KIND) in row-major order. The array is shared with the board.
+        """
+        return self._tiles
+
+    def get_health_array(self) -> bytearray:
+        """
+        Returns the health of every tile in row-major order, which is 0 for 
+        anything that is not a building. The array is shared with the board.
+        """
+        return self._health
+
+    def get_blocking_array(self) -> bytearray:
+        """
+        Returns 1 for every blocking tile and 0 for every other tile in 
+        row-major order. The array is shared with the board.
+        """
+        return self._blocking
+
+    def _get_symbols(self) -> list[str]:
+        """
+        Returns the string of tile symbols for every row of the board.
+        """
+        symbols = bytearray(self._tiles.translate(self._SYMBOL_TABLE))
+        for row, col in self.get_buildings():
+            index = row * self._cols + col
+            symbols[index] = ord('0') + self._health[index]
+        text = symbols.decode('latin-1')
+        return [text[start:start + self._cols] 
+                for start in range(0, len(text), self._cols or 1)]
+
+    def __repr__(self) -> str:
+        """
+        Returns a machine readable string that could be used to 
+        construct an identical instance of the board.
+        """
+        return f"Board({[list(row) for row in self._get_symbols()]})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the board.
+        """
+        if self._rows <= 1:
+            # matches Board, which shows a lone row as a list of tiles
+            return ''.join(
+                str([self.get_tile((row, col)) for col in range(self._cols)])
+                for row in range(self._rows))
+        return '\n'.join(self._get_symbols())
+
+
 class Entity():
+    # The model this entity belongs to, told whenever the entity moves
+    _model = None
+
     def __init__( self, position: tuple[int, int], 
                  initial_health: int, 
                  speed: int, 
@@ -288,7 +713,10 @@ class Entity():
         Parameters:
             position: new position of the entity in the format of (row, col).
         """
+        old_position = self.get_position()
         self._position_row, self._position_col = position
+        if self._model is not None:
+            self._model._entity_moved(self, old_position)
 
     def get_health(self) -> int:
         """
@@ -318,11 +746,27 @@ class Entity():
             damage: the current entity is being targeted and is about to
                     receive the amount of damage being passed in.
         """
+        old_health = self._health
         if self.is_alive():
             if (self.get_health() - damage > 0):
                 self._health = self.get_health() - damage
             else:
                 self._health = 0
+        if self._model is not None and self._health != old_health:
+            self._model._entity_health_changed(self, old_health)
+
+    def _set_health(self, health: int) -> None:
+        """
+        Sets the health of the entity directly, even if it is dead. 
+        Used to undo damage.
+
+        Parameter:
+            health: the health to restore.
+        """
+        old_health = self._health
+        self._health = health
+        if self._model is not None and health != old_health:
+            self._model._entity_health_changed(self, old_health)
 
     def is_alive(self) -> bool:
         """
@@ -362,6 +806,16 @@ class Entity():
         """
     
         entity.damage(self.get_strength())
+
+    def _clone(self) -> "Entity":
+        """
+        Returns a copy of this entity, of the same type and with the same 
+        attributes, that does not belong to any model.
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.__dict__.pop('_model', None)
+        return clone
     
     def __repr__(self) -> str:
         """
@@ -440,13 +894,19 @@ class Mech(Entity):
         """
         Enables the current Mech.
         """
+        was_active = self._enabled
         self._enabled = True
+        if self._model is not None and not was_active:
+            self._model._mech_toggled(self, was_active)
 
     def disable(self) -> None:
         """
         Disables the current Mech.
         """
+        was_active = self._enabled
         self._enabled = False
+        if self._model is not None and was_active:
+            self._model._mech_toggled(self, was_active)
 
     def is_active(self) -> bool:
         """
@@ -631,6 +1091,24 @@ class Enemy(Entity):
         """
         self._objective = self.get_position()
 
+    def choose_objective(self, 
+                         strongest_mech: tuple[int, int], 
+                         weakest_building: Optional[tuple[int, int]]
+                         ) -> None:
+        """
+        Updates the enemy's objective from targets found once for every 
+        enemy, giving the same objective as update_objective would.
+        Child classes override this together with update_objective.
+
+        Parameters:
+            strongest_mech: position of the last mech with the highest 
+                            health, or () if there are no mechs.
+            weakest_building: position of the building with the lowest 
+                              health and highest position, or None if there 
+                              are no buildings.
+        """
+        self._objective = self.get_position()
+
     def get_name(self) -> str:
         """
         Returns the name of the type of the entity ('Enemy').
@@ -732,6 +1210,20 @@ class Scorpion(Enemy):
                 _dummy_entity_pos = entity.get_position()
         self._objective = _dummy_entity_pos
 
+    def choose_objective(self, 
+                         strongest_mech: tuple[int, int], 
+                         weakest_building: Optional[tuple[int, int]]
+                         ) -> None:
+        """
+        Targets the strongest mech, as update_objective does.
+
+        Parameters:
+            strongest_mech: position of the last mech with the highest 
+                            health, or () if there are no mechs.
+            weakest_building: position of the weakest building, unused.
+        """
+        self._objective = strongest_mech
+
 
 class Firefly(Enemy):
     """
@@ -822,8 +1314,214 @@ class Firefly(Enemy):
             self._objective = max(lowest_hp_pos_list, key=lambda x: x)
         else:
             self._objective = self.get_position()    
+
+    def choose_objective(self, 
+                         strongest_mech: tuple[int, int], 
+                         weakest_building: Optional[tuple[int, int]]
+                         ) -> None:
+        """
+        Targets the weakest building, or stays put if there are none, 
+        as update_objective does.
+
+        Parameters:
+            strongest_mech: position of the strongest mech, unused.
+            weakest_building: position of the building with the lowest 
+                              health and highest position, or None if there 
+                              are no buildings.
+        """
+        if weakest_building is None:
+            self._objective = self.get_position()
+        else:
+            self._objective = weakest_building
         
         
+class DistanceField():
+    """
+    DistanceField stores the length of the shortest valid path between 
+    one origin position and every other position on a board, avoiding 
+    blocking tiles and occupied positions. 
+    The origin itself may be blocking or occupied.
+
+    A distance field is computed once with a breadth-first search and is then 
+    kept up to date as single positions become occupied or free, so that 
+    many enemies sharing an objective can share one field per turn.
+    """
+
+    def __init__(self, 
+                 board: Board, 
+                 occupied: set[tuple[int, int]], 
+                 origin: tuple[int, int]) -> None:
+        """
+        Computes the distance from origin to every reachable position.
+
+        Parameters:
+            board: the board the paths are found on.
+            occupied: positions holding an entity. This set is shared with 
+                        the caller, who must call block or unblock after 
+                        changing it.
+            origin: the position all distances are measured from.
+        """
+        self._board = board
+        self._board_rows, self._board_cols = board.get_dimensions()
+        self._occupied = occupied
+        self._origin = origin
+        self._distances = {origin: 0}
+
+        frontier = [origin]
+        steps = 0
+        while frontier:
+            steps += 1
+            next_frontier = []
+            for position in frontier:
+                for neighbour in self._neighbours(position):
+                    if (neighbour not in self._distances 
+                        and self._is_passable(neighbour)):
+                        self._distances[neighbour] = steps
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+        if INSTRUMENTATION.enabled:
+            INSTRUMENTATION.count_search("distance_field", 
+                                         len(self._distances))
+
+    def _neighbours(self, position: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Returns the vertically and horizontally adjacent positions 
+        that lie on the board.
+        """
+        neighbours = []
+        for delta_row, delta_col in PLUS_OFFSETS:
+            row, col = position[0] + delta_row, position[1] + delta_col
+            if 0 <= row < self._board_rows and 0 <= col < self._board_cols:
+                neighbours.append((row, col))
+        return neighbours
+
+    def _is_passable(self, position: tuple[int, int]) -> bool:
+        """
+        Returns True iff a path may pass through the given position.
+        """
+        return (position not in self._occupied 
+                and not self._board.get_tile(position).is_blocking())
+
+    def get_origin(self) -> tuple[int, int]:
+        """
+        Returns the position all distances are measured from.
+        """
+        return self._origin
+
+    def get_distance(self, position: tuple[int, int]) -> int:
+        """
+        Returns the length of the shortest valid path between the origin and 
+        the given position, or -1 if no such path exists.
+        """
+        return self._distances.get(position, -1)
+
+    def block(self, position: tuple[int, int]) -> None:
+        """
+        Updates the field after the given position became impassable. 
+        Only the positions whose shortest paths went through it are 
+        recomputed.
+
+        Parameter:
+            position: the position that has just been occupied.
+        """
+        if position == self._origin or position not in self._distances:
+            return
+        level = self._distances.pop(position) + 1
+
+        # find every position left without a neighbour one step closer to 
+        # the origin, working outwards from the blocked position
+        affected = set()
+        candidates = {level: [neighbour 
+                              for neighbour in self._neighbours(position)
+                              if self._distances.get(neighbour) == level]}
+        while level in candidates:
+            for candidate in candidates.pop(level):
+                if candidate in affected:
+                    continue
+                has_parent = False
+                for neighbour in self._neighbours(candidate):
+                    if (neighbour not in affected 
+                        and self._distances.get(neighbour) == level - 1):
+                        has_parent = True
+                        break
+                if not has_parent:
+                    affected.add(candidate)
+                    for neighbour in self._neighbours(candidate):
+                        if self._distances.get(neighbour) == level + 1:
+                            candidates.setdefault(level + 1, []).append(
+                                neighbour)
+            level += 1
+
+        for candidate in affected:
+            del self._distances[candidate]
+
+        # seed the affected positions from their unaffected neighbours
+        tentative = {}
+        for candidate in affected:
+            for neighbour in self._neighbours(candidate):
+                if neighbour in self._distances:
+                    distance = self._distances[neighbour] + 1
+                    if distance < tentative.get(candidate, float('inf')):
+                        tentative[candidate] = distance
+
+        # settle the affected positions in increasing order of distance
+        buckets = {}
+        for candidate, distance in tentative.items():
+            buckets.setdefault(distance, []).append(candidate)
+        level = min(buckets, default=0)
+        while buckets:
+            for candidate in buckets.pop(level, []):
+                if (candidate in self._distances 
+                    or tentative[candidate] != level):
+                    continue
+                self._distances[candidate] = level
+                for neighbour in self._neighbours(candidate):
+                    if (neighbour in affected 
+                        and neighbour not in self._distances
+                        and level + 1 < tentative.get(neighbour, 
+                                                      float('inf'))):
+                        tentative[neighbour] = level + 1
+                        buckets.setdefault(level + 1, []).append(neighbour)
+            level += 1
+
+    def unblock(self, position: tuple[int, int]) -> None:
+        """
+        Updates the field after the given position became passable. 
+        Only the positions that get closer to the origin are updated.
+
+        Parameter:
+            position: the position that has just been vacated.
+        """
+        if position == self._origin or not self._is_passable(position):
+            return
+        best = float('inf')
+        for neighbour in self._neighbours(position):
+            if neighbour in self._distances:
+                best = min(best, self._distances[neighbour] + 1)
+        if best >= self._distances.get(position, float('inf')):
+            return
+        self._distances[position] = best
+
+        # spread the shorter distances outwards from the vacated position
+        frontier = [position]
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                distance = self._distances[current] + 1
+                for neighbour in self._neighbours(current):
+                    if (distance < self._distances.get(neighbour, float('inf'))
+                        and self._is_passable(neighbour)):
+                        self._distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+
+# Kinds of action recorded in the undo history of a BreachModel
+MOVE_ACTION = "move"
+END_TURN_ACTION = "end_turn"
+
+
 class BreachModel():
     """
     BreachModel models the logical state of a game of Into The Breach.
@@ -842,6 +1540,349 @@ class BreachModel():
         self._board = board
         self._entities = entities
 
+        # Zobrist hash of the game state, built by get_state_hash and then 
+        # kept up to date by the change hooks below
+        self._zobrist = None
+
+        # live position index and stable integer handles for the entities
+        self._entity_positions = {}
+        self._entity_ids = {}
+        self._entities_by_id = {}
+        self._next_entity_id = 0
+        for entity in entities:
+            self._register_entity(entity)
+
+        # undo history: one (kind, moved flag before, deltas) per action, 
+        # where the deltas are only the changes the action made
+        self._history = []
+        self._action = None
+        board._model = self
+        # the journal every action is appended to, see start_journal
+        self._journal = None
+
+        # bumped by every change to the game state; queries are cached 
+        # per entity handle as (version, result)
+        self._version = 0
+        self._movement_cache = {}
+        self._valid_positions_cache = {}
+        self._target_cache = {}
+        # attack kernels by entity type, see _get_attack_kernel
+        self._attack_kernels = {}
+        # damage each position would take from the live enemies' next 
+        # attacks, built by get_danger_map and then kept up to date
+        self._danger = None
+
+    def _register_entity(self, 
+                         entity: Entity, 
+                         entity_id: Optional[int] = None) -> int:
+        """
+        Gives the entity a new handle, or the given one if it is restoring 
+        a removed entity, adds it to the position index and attaches it to 
+        this model so that its changes are tracked.
+        Returns the entity's handle.
+        """
+        if entity_id is None:
+            entity_id = self._next_entity_id
+            self._next_entity_id += 1
+        self._entity_ids[entity] = entity_id
+        self._entities_by_id[entity_id] = entity
+        self._entity_positions[entity.get_position()] = entity
+        entity._model = self
+        if self._zobrist is not None:
+            self._zobrist ^= self._get_entity_key(entity)
+        return entity_id
+
+    def _remove_entity(self, entity: Entity) -> None:
+        """
+        Removes the entity from the entity list, the position index and 
+        the handle lookup. Its handle is never reused.
+        """
+        index = self._entities.index(entity)
+        del self._entities[index]
+        indexed = self._entity_positions.get(entity.get_position()) is entity
+        if indexed:
+            del self._entity_positions[entity.get_position()]
+        entity_id = self._entity_ids.pop(entity)
+        del self._entities_by_id[entity_id]
+        entity._model = None
+        if not entity.is_friendly() and entity.is_alive():
+            self._add_danger(entity, entity.get_position(), -1)
+        if self._zobrist is not None:
+            self._zobrist ^= self._get_entity_key(entity)
+        self._state_changed(("remove", entity_id, entity, index, indexed))
+
+    def _entity_moved(self, 
+                      entity: Entity, 
+                      old_position: tuple[int, int]) -> None:
+        """
+        Updates the position index after the given entity has moved.
+        Called by Entity.set_position.
+        """
+        if self._entity_positions.get(old_position) is entity:
+            del self._entity_positions[old_position]
+        self._entity_positions[entity.get_position()] = entity
+        if not entity.is_friendly() and entity.is_alive():
+            self._add_danger(entity, old_position, -1)
+            self._add_danger(entity, entity.get_position(), 1)
+        if self._zobrist is not None:
+            self._zobrist ^= (self._get_entity_key(entity, old_position)
+                              ^ self._get_entity_key(entity))
+        self._state_changed(("move", self._entity_ids[entity], old_position))
+
+    def _entity_health_changed(self, entity: Entity, old_health: int) -> None:
+        """
+        Records a change to the health of the given entity.
+        Called by Entity.damage.
+        """
+        if not entity.is_friendly() and entity.is_alive() != (old_health > 0):
+            # an enemy died or was brought back by undo
+            self._add_danger(entity, entity.get_position(), 
+                             1 if entity.is_alive() else -1)
+        if self._zobrist is not None:
+            self._zobrist ^= (self._get_entity_key(entity, health=old_health)
+                              ^ self._get_entity_key(entity))
+        self._state_changed(("health", self._entity_ids[entity], old_health))
+
+    def _mech_toggled(self, mech: Mech, was_active: bool) -> None:
+        """
+        Records the given mech being enabled or disabled.
+        Called by Mech.enable and Mech.disable.
+        """
+        if self._zobrist is not None:
+            self._zobrist ^= (self._get_entity_key(mech, active=was_active)
+                              ^ self._get_entity_key(mech))
+        self._state_changed(("active", self._entity_ids[mech], was_active))
+
+    def _building_damaged(self, 
+                          position: tuple[int, int], 
+                          old_health: int) -> None:
+        """
+        Records a change to the health of the building at the given position.
+        Called by Board when a building's health changes.
+        """
+        if self._zobrist is not None:
+            new_health = int(str(self.get_board().get_tile(position)))
+            self._zobrist ^= (zobrist_key(BUILDING_KIND, *position, old_health)
+                              ^ zobrist_key(BUILDING_KIND, *position, 
+                                            new_health))
+        self._state_changed(("building", position, old_health))
+
+    def _state_changed(self, delta: tuple) -> None:
+        """
+        Bumps the state version, which makes every cached query stale, 
+        and adds the change to the action being recorded, if there is one.
+        """
+        self._version += 1
+        if self._action is not None:
+            self._action.append(delta)
+
+    def _begin_action(self) -> None:
+        """
+        Starts recording the changes made by an action, so it can be undone.
+        """
+        self._action = []
+
+    def _end_action(self, kind: str, moved_made: bool) -> None:
+        """
+        Stops recording and adds the action to the undo history 
+        if it changed anything.
+
+        Parameters:
+            kind: MOVE_ACTION or END_TURN_ACTION.
+            moved_made: whether a move had been made before the action.
+        """
+        undoable = bool(self._action) or moved_made != self._any_moved_made
+        if undoable:
+            self._history.append((kind, moved_made, self._action))
+        if self._journal is not None:
+            self._journal_action(kind, self._action, undoable)
+        self._action = None
+
+    def can_undo(self, kind: Optional[str] = None) -> bool:
+        """
+        Returns True iff there is an action to undo, and if kind is given, 
+        the last action is of that kind.
+
+        Parameter:
+            kind: MOVE_ACTION, END_TURN_ACTION, or None for either.
+        """
+        if not self._history:
+            return False
+        return kind is None or self._history[-1][0] == kind
+
+    def undo(self) -> Optional[str]:
+        """
+        Reverts the last successful call to attempt_move or end_turn, 
+        in time proportional to the number of changes it made.
+        Returns the kind of action undone, or None if there was none.
+        """
+        if not self._history:
+            return None
+        kind, moved_made, deltas = self._history.pop()
+        board = self.get_board()
+        for delta in reversed(deltas):
+            change = delta[0]
+            if change == "building":
+                _, position, old_health = delta
+                board.get_tile(position)._set_health(old_health)
+            elif change == "remove":
+                _, entity_id, entity, index, indexed = delta
+                self._entities.insert(index, entity)
+                self._version += 1
+                # another entity may have been indexed at its position 
+                # when it was removed
+                occupant = self._entity_positions.get(entity.get_position())
+                self._register_entity(entity, entity_id)
+                if not entity.is_friendly() and entity.is_alive():
+                    self._add_danger(entity, entity.get_position(), 1)
+                if not indexed and occupant is not None:
+                    self._entity_positions[entity.get_position()] = occupant
+                elif not indexed:
+                    del self._entity_positions[entity.get_position()]
+            else:
+                entity = self._entities_by_id[delta[1]]
+                if change == "move":
+                    entity.set_position(delta[2])
+                elif change == "health":
+                    entity._set_health(delta[2])
+                elif delta[2]:
+                    entity.enable()
+                else:
+                    entity.disable()
+        self._any_moved_made = moved_made
+        if (self._journal is not None 
+            and not self._journal.record_undo(kind == END_TURN_ACTION)):
+            # the action came before the last checkpoint
+            self._write_checkpoint()
+        return kind
+
+    def start_journal(self, 
+                      file_path: str, 
+                      checkpoint_interval: int = JOURNAL_CHECKPOINT_TURNS
+                      ) -> None:
+        """
+        Starts appending every successful move, end of turn and undo to a 
+        new action journal at the given path, beginning with a checkpoint of 
+        the current game state and adding one every checkpoint_interval 
+        turns. Each end of turn records where every entity moved to. 
+        The journal is read back by load_journal.
+
+        Parameters:
+            file_path: path of the journal file, which is replaced.
+            checkpoint_interval: turns between checkpoints.
+        """
+        self.stop_journal()
+        self._journal = ActionJournal(file_path, checkpoint_interval)
+        self._write_checkpoint()
+
+    def stop_journal(self) -> None:
+        """
+        Stops journaling and closes the journal file, if there is one.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _write_checkpoint(self) -> None:
+        """
+        Records the full game state, with every entity's handle, 
+        in the journal.
+        """
+        self._journal.record_checkpoint(
+            self._next_entity_id, 
+            [self._entity_ids[entity] for entity in self._entities], 
+            self.to_snapshot())
+
+    def _journal_action(self, kind: str, deltas: list, undoable: bool) -> None:
+        """
+        Records an action that has just finished in the journal.
+
+        Parameters:
+            kind: MOVE_ACTION or END_TURN_ACTION.
+            deltas: the changes the action made.
+            undoable: whether the action was added to the undo history.
+        """
+        moves = self._get_moved_entities(deltas)
+        if kind == MOVE_ACTION:
+            for entity_id, position in moves:
+                self._journal.record_move(entity_id, position)
+            return
+        self._journal.record_end_turn(moves, undoable)
+        if self._journal.checkpoint_due():
+            self._write_checkpoint()
+
+    def _get_moved_entities(self, 
+                            deltas: list
+                            ) -> list[tuple[int, tuple[int, int]]]:
+        """
+        Returns the (handle, current position) of every entity still in 
+        the game that one of the given changes moved, in the order they 
+        first moved.
+        """
+        moves = {}
+        for delta in deltas:
+            if delta[0] == "move" and delta[1] in self._entities_by_id:
+                moves[delta[1]] = self._entities_by_id[delta[1]].get_position()
+        return list(moves.items())
+
+    def _replay_record(self, kind: bytes, values: tuple) -> None:
+        """
+        Repeats the action recorded in a journal record, as returned by 
+        read_journal, checking that it has the recorded outcome. 
+        A checkpoint is compared with the current state instead.
+
+        Raises:
+            ValueError: if the action does not have the recorded outcome.
+        """
+        if kind == JOURNAL_MOVE:
+            entity_id, position = values
+            entity = self.get_entity_by_id(entity_id)
+            if entity is not None:
+                self.attempt_move(entity, position)
+            if entity is None or entity.get_position() != position:
+                raise ValueError(f"entity {entity_id} cannot move to "
+                                 f"{position}")
+        elif kind == JOURNAL_END_TURN:
+            history_length = len(self._history)
+            self.end_turn()
+            moves = []
+            if len(self._history) > history_length:
+                moves = self._get_moved_entities(self._history[-1][2])
+            if moves != values[1]:
+                raise ValueError(f"turn {values[0]} moved {moves} "
+                                 f"but {values[1]} were recorded")
+        elif kind == JOURNAL_UNDO:
+            undone = self.undo()
+            if undone != (END_TURN_ACTION if values[0] else MOVE_ACTION):
+                raise ValueError("the recorded undo cannot be replayed")
+        else:
+            checkpoint = _load_checkpoint(values)
+            if (checkpoint.to_snapshot(compress=False) 
+                != self.to_snapshot(compress=False) 
+                or list(map(checkpoint.get_entity_id, 
+                            checkpoint.get_entities())) 
+                   != list(map(self.get_entity_id, self.get_entities()))):
+                raise ValueError(f"the state differs from the checkpoint "
+                                 f"at turn {values[0]}")
+
+    def _set_entity_ids(self, 
+                        entity_ids: list[int], 
+                        next_entity_id: int) -> None:
+        """
+        Gives the entities the given handles, in priority order, 
+        so that they match the handles of the model they were copied from.
+
+        Parameters:
+            entity_ids: the handle of every entity, in priority order.
+            next_entity_id: the handle the next new entity would get.
+        """
+        self._entity_ids = {}
+        self._entities_by_id = {}
+        for entity, entity_id in zip(self._entities, entity_ids):
+            self._entity_ids[entity] = entity_id
+            self._entities_by_id[entity_id] = entity
+        self._next_entity_id = next_entity_id
+
     def __str__(self) -> str:
         """
         Returns the string representation of the model.
@@ -878,22 +1919,15 @@ class BreachModel():
             At least 1 Building is not destroyed.
         """
         current_board = self.get_board()
-        current_building_dict = current_board.get_buildings()
-
         current_entities_list = self.get_entities()
 
-        # use is_destroyed method under Building/Mechs to check 
-        _buildings_destroyed = 0
+        # the board keeps count of the buildings still standing
+        _buildings_destroyed = current_board.get_standing_building_count()
         _mechs_destroyed = 0
 
         _enemies_counter = 0
         _enemies_destroyed = 0
 
-        # check for number of destroyed buildings
-        for building in current_building_dict.values():
-            if not building.is_destroyed():
-                _buildings_destroyed += 1
-
         # check for number of destroyed Mechs aka friendly entities
         for entity in current_entities_list:
             if (entity.is_friendly() and entity.is_alive()):
@@ -925,31 +1959,19 @@ class BreachModel():
             ALL Mechs are destroyed.
         """
         current_board = self.get_board()
-        current_building_dict = current_board.get_buildings()
         current_entities_list = self.get_entities()
 
-        # check total numbers of buildings and mechs
-        _buildings_counter = 0
+        # check total numbers of mechs
         _mechs_counter = 0
 
-        # use is_destroyed method under Building/Mechs to check 
-        _buildings_destroyed = 0
+        # use is_destroyed method under Mechs to check 
         _mechs_destroyed = 0
 
-        # check for total number of buildings
-        for building in current_building_dict.values():
-            _buildings_counter += 1
-
         # check for total number of mechs
         for entity in current_entities_list:
             if entity.is_friendly() == True:
                 _mechs_counter += 1
 
-        # check for number of destroyed buildings
-        for building in current_building_dict.values():
-            if building.is_destroyed() == True:
-                _buildings_destroyed += 1
-
         # check for number of destroyed Mechs
         for entity in current_entities_list:
             if entity.is_alive() == False:
@@ -958,107 +1980,458 @@ class BreachModel():
         # return True only when:
         # ALL buildings are destroyed, OR
         # ALL mechs are destroyed
-        return ((_buildings_counter == _buildings_destroyed) 
+        return ((current_board.get_standing_building_count() == 0) 
                 or (_mechs_counter == _mechs_destroyed))
     
     def entity_positions(self) -> dict[tuple[int, int], Entity]:
         """
         Returns a dictionary containing all entities, 
         indexed by entity position.
+        The dictionary is a copy of the model's live index, 
+        use get_entity_at for single lookups.
         """
-        current_entites = self.get_entities()
-        dict_entities = {}
-        for entity in current_entites:
-            dict_entities[entity.get_position()] = entity
+        return dict(self._entity_positions)
 
-        return dict_entities
-    
-    def get_valid_movement_positions(self, 
-                                     entity: Entity) -> list[tuple[int, int]]:
-        """
-        Returns the list of positions that the given entity could move to during
-         the relevant movement phase. This function does not check if the entity
-         has already moved during a given movement phase.
+    def get_entity_at(self, position: tuple[int, int]) -> Optional[Entity]:
         """
-        valid_positions = []
-        board_dimensions = self.get_board().get_dimensions()
-        entity_position = entity.get_position()
-        entity_speed = entity.get_speed()
+        Returns the entity at the given position, or None if there is none.
 
-        # Iterate over all possible positions on the board
-        for row in range(board_dimensions[0]):
-            for col in range(board_dimensions[1]):
-                new_position = (row, col)
+        Parameter:
+            position: the (row, col) position to look up.
+        """
+        return self._entity_positions.get(position)
 
-                # Skip the current position of the entity
-                if new_position == entity_position:
-                    continue
-                
-                # Check if the new position is within the board dimensions
-                if ((0 <= new_position[0] < board_dimensions[0]) 
-                    and (0 <= new_position[1] < board_dimensions[1])):
-                    # Check if the new position is valid
-                    tile = self.get_board().get_tile(new_position)
-                    if (not tile.is_blocking() 
-                        and new_position not in self.entity_positions().keys()):
-                        # Calculate the distance 
-                        # from the entity's current position to the new position
-                        distance = get_distance(self, 
-                                                entity_position, 
-                                                new_position)
-                        
-                        # If the distance is within the entity's speed, 
-                        # add the new position to the list
-                        if distance != -1 and distance <= entity_speed:
-                            valid_positions.append(new_position)
-        
-        # Sort the valid positions based on the specified order
-        valid_positions.sort(key=lambda pos: (pos[0], pos[1]))
-        
-        return valid_positions
-    
-    def attempt_move(self, entity: Entity, position: tuple[int, int]) -> None:
+    def get_entity_id(self, entity: Entity) -> int:
         """
-        Moves the given entity to the specified position only if 
-        the entity is friendly, active, and can move to that position 
-        according to the game rules. Does nothing otherwise. 
-        Disables entity if a successful move is made.
+        Returns the handle of the given entity. Handles are integers given 
+        out when the model is created and stay the same for the rest of 
+        the game, even as the entity moves.
 
         Parameter:
-            entity: the selected entity for moving.
-            position: a destination selectable for moving.
+            entity: an entity belonging to this model.
         """
-        if entity.is_friendly():
-            if entity.is_active():
-                if position in self.get_valid_movement_positions(entity):
-                    entity.set_position(position)
-                    entity.disable()
-                    self._any_moved_made = True
-        else:
-            if position in self.get_valid_movement_positions(entity):
-                entity.set_position(position)
-                self._any_moved_made = True
+        return self._entity_ids[entity]
 
-    def ready_to_save(self) -> bool:
+    def get_entity_by_id(self, entity_id: int) -> Optional[Entity]:
         """
-        Returns true only when no move has been made 
-        since the last call to end_turn.
+        Returns the entity with the given handle, or None if that entity 
+        has been removed from the game.
+
+        Parameter:
+            entity_id: a handle from get_entity_id.
         """
-        return (not self._any_moved_made)
+        return self._entities_by_id.get(entity_id)
     
-    def assign_objectives(self) -> None:
+    def get_version(self) -> int:
         """
-        Updates the objectives of all enemies based on the current game state.
+        Returns the state version: a number that changes whenever anything 
+        in the game state changes, and never goes back to an earlier value.
         """
+        return self._version
 
-        entities_list = self.get_entities()
-        buildings_dict = self.get_board().get_buildings()
+    def get_targets(self, entity: Entity) -> list[tuple[int, int]]:
+        """
+        Returns the positions that would be attacked by the given entity, 
+        as Entity.get_targets does, cached until the game state changes.
 
-        for entity in entities_list:
+        Parameter:
+            entity: the entity whose targets are returned.
+        """
+        entity_id = self._entity_ids.get(entity)
+        cached = self._target_cache.get(entity_id)
+        if cached is not None and cached[0] == self._version:
+            return list(cached[1])
+        targets = entity.get_targets()
+        if entity_id is not None:
+            self._target_cache[entity_id] = (self._version, tuple(targets))
+        return targets
+
+    def get_danger_map(self) -> dict[tuple[int, int], int]:
+        """
+        Returns a dictionary mapping every position that a live enemy 
+        targets to the total damage the enemies targeting it would deal 
+        if they attacked now. Positions nobody targets are left out.
+
+        The map is built the first time it is asked for, and then kept up 
+        to date as enemies move, die or are restored, at the cost of one 
+        enemy's targets per change.
+        """
+        if self._danger is None:
+            self._danger = {}
+            for entity in self.get_entities():
+                if not entity.is_friendly() and entity.is_alive():
+                    self._add_danger(entity, entity.get_position(), 1)
+        return dict(self._danger)
+
+    def _add_danger(self, 
+                    entity: Entity, 
+                    position: tuple[int, int], 
+                    sign: int) -> None:
+        """
+        Adds the given enemy's damage, attacking from the given position, 
+        to the danger map, or takes it away if sign is -1. 
+        Does nothing if the danger map has not been built.
+        """
+        danger = self._danger
+        if danger is None:
+            return
+        damage = entity.get_strength() * sign
+        for target in self._get_attack_targets(entity, position):
+            total = danger.get(target, 0) + damage
+            if total:
+                danger[target] = total
+            else:
+                danger.pop(target, None)
+
+    def get_state_hash(self) -> int:
+        """
+        Returns a 64-bit Zobrist hash of the game state: the board layout, 
+        the health of every building, and the type, position, health, speed, 
+        strength and active flag of every entity. Equal states hash equal, 
+        so the hash can key caches of results computed from a state.
+        The priority order of the entities and whether a move has been made 
+        this turn are not part of the hash.
+
+        The hash is built the first time it is asked for, and then updated 
+        in constant time by every move, damage, toggle and removal.
+        """
+        if self._zobrist is None:
+            board = self.get_board()
+            rows, cols = board.get_dimensions()
+            state_hash = zobrist_key(rows, cols)
+            if isinstance(board, CompactBoard):
+                tiles = board.get_tile_array()
+                index = tiles.find(MOUNTAIN_KIND)
+                while index != -1:
+                    state_hash ^= zobrist_key(MOUNTAIN_KIND, 
+                                              *divmod(index, cols))
+                    index = tiles.find(MOUNTAIN_KIND, index + 1)
+            else:
+                for row in range(rows):
+                    for col in range(cols):
+                        if isinstance(board.get_tile((row, col)), Mountain):
+                            state_hash ^= zobrist_key(MOUNTAIN_KIND, row, col)
+            for position, building in board.get_buildings().items():
+                state_hash ^= zobrist_key(BUILDING_KIND, *position, 
+                                          int(str(building)))
+            for entity in self.get_entities():
+                state_hash ^= self._get_entity_key(entity)
+            self._zobrist = state_hash
+        return self._zobrist
+
+    def _get_entity_key(self, 
+                        entity: Entity, 
+                        position: Optional[tuple[int, int]] = None, 
+                        health: Optional[int] = None, 
+                        active: Optional[bool] = None) -> int:
+        """
+        Returns the Zobrist key of the given entity with its current 
+        attributes, or with the given position, health or active flag instead.
+        """
+        if position is None:
+            position = entity.get_position()
+        if health is None:
+            health = entity.get_health()
+        if active is None:
+            active = entity.is_active() if isinstance(entity, Mech) else True
+        return zobrist_key(ord(entity.get_symbol()), *position, health, 
+                           entity.get_speed(), entity.get_strength(), active)
+
+    def get_movement_distances(self, 
+                               entity: Entity) -> dict[tuple[int, int], int]:
+        """
+        Returns a dictionary mapping every position the given entity could 
+        move to during the relevant movement phase to the number of steps 
+        needed to get there. The entity's own position is not included.
+        The result is cached until the game state changes.
+
+        Parameter:
+            entity: the entity whose reachable positions are computed.
+        """
+        entity_id = self._entity_ids.get(entity)
+        cached = self._movement_cache.get(entity_id)
+        if cached is not None and cached[0] == self._version:
+            return dict(cached[1])
+        distances = self._find_movement_distances(entity)
+        if entity_id is not None:
+            self._movement_cache[entity_id] = (self._version, distances)
+        return dict(distances)
+
+    def _find_movement_distances(self, 
+                                 entity: Entity
+                                 ) -> dict[tuple[int, int], int]:
+        """
+        Finds the distances returned by get_movement_distances.
+
+        The distances are found with a single breadth-first flood fill from 
+        the entity's position that stops once the entity's speed is reached, 
+        avoiding blocking tiles and tiles occupied by other entities.
+
+        Parameter:
+            entity: the entity whose reachable positions are computed.
+        """
+        board = self.get_board()
+        board_rows, board_cols = board.get_dimensions()
+        occupied = self._entity_positions
+        entity_position = entity.get_position()
+        entity_speed = entity.get_speed()
+
+        distances = {}
+        visited = {entity_position}
+        frontier = [entity_position]
+        steps = 0
+
+        # expand one ring of tiles per step until the speed is used up
+        while frontier and steps < entity_speed:
+            steps += 1
+            next_frontier = []
+            for row, col in frontier:
+                for delta_row, delta_col in PLUS_OFFSETS:
+                    new_position = (row + delta_row, col + delta_col)
+                    if new_position in visited:
+                        continue
+                    visited.add(new_position)
+                    if ((0 <= new_position[0] < board_rows)
+                        and (0 <= new_position[1] < board_cols)
+                        and new_position not in occupied
+                        and not board.get_tile(new_position).is_blocking()):
+                        distances[new_position] = steps
+                        next_frontier.append(new_position)
+            frontier = next_frontier
+
+        if INSTRUMENTATION.enabled:
+            INSTRUMENTATION.count_search("movement", len(visited))
+        return distances
+
+    def get_valid_movement_positions(self, 
+                                     entity: Entity) -> list[tuple[int, int]]:
+        """
+        Returns the list of positions that the given entity could move to during
+        the relevant movement phase. This function does not check if the entity
+        has already moved during a given movement phase.
+
+        Positions are sorted by row, then by column.
+        """
+        entity_id = self._entity_ids.get(entity)
+        cached = self._valid_positions_cache.get(entity_id)
+        if cached is not None and cached[0] == self._version:
+            return list(cached[1])
+        positions = sorted(self.get_movement_distances(entity))
+        if entity_id is not None:
+            self._valid_positions_cache[entity_id] = (self._version, 
+                                                      tuple(positions))
+        return positions
+    
+    def attempt_move(self, entity: Entity, position: tuple[int, int]) -> None:
+        """
+        Moves the given entity to the specified position only if 
+        the entity is friendly, active, and can move to that position 
+        according to the game rules. Does nothing otherwise. 
+        Disables entity if a successful move is made.
+
+        Parameter:
+            entity: the selected entity for moving.
+            position: a destination selectable for moving.
+        """
+        moved_made = self._any_moved_made
+        self._begin_action()
+        if entity.is_friendly():
+            if entity.is_active():
+                if position in self.get_valid_movement_positions(entity):
+                    entity.set_position(position)
+                    entity.disable()
+                    self._any_moved_made = True
+        else:
+            if position in self.get_valid_movement_positions(entity):
+                entity.set_position(position)
+                self._any_moved_made = True
+        self._end_action(MOVE_ACTION, moved_made)
+
+    def to_snapshot(self, compress: bool = True) -> bytes:
+        """
+        Returns the full game state as a binary snapshot: the board as packed 
+        tile and health arrays, and every entity as a fixed-width record 
+        including whether it is an active mech.
+
+        Parameter:
+            compress: whether to compress the snapshot.
+        """
+        board = self.get_board()
+        tiles, health = self._get_board_arrays()
+
+        entity_records = []
+        for entity in self.get_entities():
+            # the string representation holds every value in file form
+            symbol, *values = str(entity).split(',')
+            active = entity.is_active() if isinstance(entity, Mech) else True
+            entity_records.append((symbol, *map(int, values), active))
+
+        return pack_snapshot(board.get_dimensions(), tiles, health, 
+                             entity_records, int(self._any_moved_made), 
+                             compress)
+
+    def _get_board_arrays(self) -> tuple[bytes, bytes]:
+        """
+        Returns the kind and the health of every tile on the board in 
+        row-major order, as CompactBoard stores them, for either kind of board.
+        """
+        board = self.get_board()
+        if isinstance(board, CompactBoard):
+            return (bytes(board.get_tile_array()), 
+                    bytes(board.get_health_array()))
+        board_rows, board_cols = board.get_dimensions()
+        tiles = bytearray(board_rows * board_cols)
+        health = bytearray(board_rows * board_cols)
+        for row in range(board_rows):
+            for col in range(board_cols):
+                tile = board.get_tile((row, col))
+                index = row * board_cols + col
+                if isinstance(tile, Building):
+                    tiles[index] = BUILDING_KIND
+                    health[index] = int(str(tile))
+                elif isinstance(tile, Mountain):
+                    tiles[index] = MOUNTAIN_KIND
+        return bytes(tiles), bytes(health)
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> "BreachModel":
+        """
+        Returns the model stored in a snapshot made by to_snapshot.
+
+        Parameter:
+            data: the snapshot.
+
+        Raises:
+            ValueError: if the data is not a valid snapshot.
+        """
+        dimensions, tiles, health, entity_records, model_flags = (
+            unpack_snapshot(data))
+        board = CompactBoard.from_arrays(dimensions, tiles, health)
+        entities = []
+        for symbol, *values, active in entity_records:
+            entity = parse_entity(','.join(map(str, [symbol, *values])), 
+                                  dimensions)
+            if not active:
+                entity.disable()
+            entities.append(entity)
+
+        model = cls(board, entities)
+        model._any_moved_made = bool(model_flags & 1)
+        return model
+
+    def copy(self) -> "BreachModel":
+        """
+        Returns an independent copy of the game state, whose entities have 
+        the same handles as the entities of this model. 
+        The undo history is not copied.
+        """
+        return self.fork()
+
+    def fork(self) -> "BreachModel":
+        """
+        Returns an independent copy of the game state that is cheap enough 
+        to make for every branch of a look-ahead search. 
+
+        The fork shares the board's arrays with this model until either 
+        of them changes a building (see CompactBoard.fork), and gets a 
+        shallow copy of every entity with the same handle as here, 
+        so no tiles are created and nothing is parsed. The state hash and 
+        danger map carry over if they have been built. 
+        Changes to one model never show in the other. 
+        The undo history is not copied.
+        """
+        board = self.get_board()
+        if isinstance(board, CompactBoard):
+            board = board.fork()
+        else:
+            board = CompactBoard.from_arrays(board.get_dimensions(), 
+                                             *self._get_board_arrays())
+        model = BreachModel(board, 
+                            [entity._clone() for entity in self._entities])
+        model._set_entity_ids([self._entity_ids[entity] 
+                               for entity in self._entities], 
+                              self._next_entity_id)
+        model._any_moved_made = self._any_moved_made
+        # kernels depend only on entity types, so they can be shared
+        model._attack_kernels = self._attack_kernels
+        model._zobrist = self._zobrist
+        if self._danger is not None:
+            model._danger = dict(self._danger)
+        return model
+
+    def apply_end_turn(self, result: "BreachModel") -> None:
+        """
+        Makes this game state the same as result, a copy of this model 
+        made by copy() that has since had end_turn called on it. 
+        The changes are recorded as one end turn action that can be undone, 
+        just as if end_turn had been called on this model.
+
+        Parameter:
+            result: the copy the turn was played on.
+        """
+        moved_made = self._any_moved_made
+        self._begin_action()
+
+        result_board = result.get_board()
+        for position, building in self.get_board().get_buildings().items():
+            health = int(str(result_board.get_tile(position)))
+            if health != int(str(building)):
+                building._set_health(health)
+
+        # dead entities are removed before anything moves, as in end_turn
+        for entity in list(self._entities):
+            if result.get_entity_by_id(self._entity_ids[entity]) is None:
+                self._remove_entity(entity)
+        for entity in self._entities:
+            result_entity = result.get_entity_by_id(self._entity_ids[entity])
+            if result_entity.get_position() != entity.get_position():
+                entity.set_position(result_entity.get_position())
+            if result_entity.get_health() != entity.get_health():
+                entity._set_health(result_entity.get_health())
+            if isinstance(entity, Mech) and result_entity.is_active():
+                entity.enable()
+            elif isinstance(entity, Mech):
+                entity.disable()
+            if isinstance(entity, Enemy):
+                entity._objective = result_entity.get_objective()
+
+        self._any_moved_made = result._any_moved_made
+        self._end_action(END_TURN_ACTION, moved_made)
+
+    def ready_to_save(self) -> bool:
+        """
+        Returns true only when no move has been made 
+        since the last call to end_turn.
+        """
+        return (not self._any_moved_made)
+    
+    def assign_objectives(self) -> None:
+        """
+        Updates the objectives of all enemies based on the current game state.
+        The targets enemies choose between are found once, so each enemy's 
+        objective takes constant time to choose.
+        """
+
+        entities_list = self.get_entities()
+
+        # find each kind of target once for the turn: the last mech with 
+        # the highest health (dead mechs included), and the building with 
+        # the lowest health and highest position (destroyed ones included)
+        strongest_health = 0
+        strongest_mech = ()
+        for entity in entities_list:
+            if entity.is_friendly() and entity.get_health() >= strongest_health:
+                strongest_health = entity.get_health()
+                strongest_mech = entity.get_position()
+        weakest_building = self.get_board().get_lowest_health_building()
+
+        for entity in entities_list:
             if not entity.is_friendly():
-                entity.update_objective(entities_list, buildings_dict)
+                entity.choose_objective(strongest_mech, weakest_building)
      
-    def move_enemies(self) -> None:
+    def move_enemies(self, 
+                     progress: Optional[Callable[[int, int], None]] = None
+                     ) -> None:
         """
         Moves each enemy to the valid movement position that minimizes 
         the distance of the shortest valid path between the position 
@@ -1072,22 +2445,41 @@ class BreachModel():
         the enemy does not move. 
         Enemies move in descending priority order starting with 
         the highest priority enemy.
+
+        Parameter:
+            progress: called with (enemies done, total enemies) 
+                      before each enemy moves, if given.
         """
         entities_list = self.get_entities()
+        board = self.get_board()
+        # distance fields are shared by every enemy with the same objective 
+        # and kept up to date as enemies move
+        occupied = set(self._entity_positions)
+        distance_fields = {}
+        enemy_count = sum(not entity.is_friendly() for entity in entities_list)
+        enemies_done = 0
         
         for entity in entities_list:
             # check for enemy
             if not entity.is_friendly():
+                if progress is not None:
+                    progress(enemies_done, enemy_count)
+                enemies_done += 1
                 all_valid_pos = self.get_valid_movement_positions(entity)
                 enemy_obj = entity.get_objective()
                 # check for valid movements exist and the enemy has an obj
                 if all_valid_pos and enemy_obj:
+                    if enemy_obj not in distance_fields:
+                        distance_fields[enemy_obj] = DistanceField(board, 
+                                                                   occupied, 
+                                                                   enemy_obj)
+                    distance_field = distance_fields[enemy_obj]
                     potential_move = all_valid_pos[0]
                     same_dist_pos_list = []
                     no_route_found_pos_list = []
                     shortest_dist = float('inf')
                     for valid_pos in all_valid_pos:
-                        cal_dist = get_distance(self, enemy_obj, valid_pos)
+                        cal_dist = distance_field.get_distance(valid_pos)
                         if cal_dist < shortest_dist and cal_dist != -1:
                             shortest_dist = cal_dist
                             potential_move = valid_pos
@@ -1104,37 +2496,94 @@ class BreachModel():
                     
                     # if there are not positions with same distance to target
                     if not same_dist_pos_list:
-                        self.attempt_move(entity, potential_move)
+                        new_position = potential_move
                     else:
                         if entity.get_position() in same_dist_pos_list:
                             same_dist_pos_list.remove(entity.get_position())
-                        self.attempt_move(entity,sorted(same_dist_pos_list, 
-                                                        key=lambda x: x,
-                                                        reverse=True)[0])
+                        new_position = sorted(same_dist_pos_list, 
+                                              key=lambda x: x,
+                                              reverse=True)[0]
+
+                    # every candidate is a valid movement position already
+                    old_position = entity.get_position()
+                    entity.set_position(new_position)
+                    self._any_moved_made = True
+                    occupied.discard(old_position)
+                    occupied.add(new_position)
+                    for distance_field in distance_fields.values():
+                        distance_field.block(new_position)
+                        distance_field.unblock(old_position)
 
     def make_attack(self, entity: Entity) -> None:
         """
         Makes given entity perform an attack against every tile that 
-        is currently a target of the entity.
+        is currently a target of the entity. Targets off the board are 
+        skipped without being looked up.
 
         Parameter:
             entity: an entity instance, can be a mech or an enemy.
         """
-        _attack_range = entity.get_targets()
         _entity_strength = entity.get_strength()
         _all_buildings = self.get_board().get_buildings()
-        _all_buildings_key = _all_buildings.keys()
-        _entity_pos_dict = self.entity_positions()
-        _entity_positions = _entity_pos_dict.keys()
+        _entity_pos_dict = self._entity_positions
+
+        for target_pos in self._get_attack_targets(entity):
+            target_entity = _entity_pos_dict.get(target_pos)
+            if target_entity is not None:
+                entity.attack(target_entity)
+            elif target_pos in _all_buildings:
+                _all_buildings[target_pos].damage(_entity_strength)
+
+    def _get_attack_kernel(self, entity: Entity) -> tuple:
+        """
+        Returns the attack kernel of the entity's type: the offsets of its 
+        targets from its position, in get_targets order, and the smallest 
+        and largest row and column offsets. Kernels are worked out once 
+        per type, as every type targets the same pattern around itself.
+        """
+        kernel = self._attack_kernels.get(type(entity))
+        if kernel is None:
+            row, col = entity.get_position()
+            offsets = tuple((target_row - row, target_col - col) 
+                            for target_row, target_col in entity.get_targets())
+            row_offsets = [offset[0] for offset in offsets] or [0]
+            col_offsets = [offset[1] for offset in offsets] or [0]
+            kernel = (offsets, min(row_offsets), max(row_offsets), 
+                      min(col_offsets), max(col_offsets))
+            self._attack_kernels[type(entity)] = kernel
+        return kernel
+
+    def _get_attack_targets(self, 
+                            entity: Entity, 
+                            position: Optional[tuple[int, int]] = None
+                            ) -> list[tuple[int, int]]:
+        """
+        Returns the targets of the entity that are on the board, 
+        in get_targets order.
 
-        for target_pos in _attack_range:
-            if target_pos in _entity_positions:
-                entity.attack(_entity_pos_dict[target_pos])
-            elif target_pos in _all_buildings_key:
-                self.get_board().get_tile(target_pos).damage(_entity_strength)
-
-
-    def end_turn(self) -> None:
+        Parameters:
+            entity: the attacking entity.
+            position: the position to attack from, 
+                      or None for the entity's position.
+        """
+        offsets, min_row, max_row, min_col, max_col = (
+            self._get_attack_kernel(entity))
+        row, col = position or entity.get_position()
+        board_rows, board_cols = self.get_board().get_dimensions()
+        targets = [(row + delta_row, col + delta_col) 
+                   for delta_row, delta_col in offsets]
+        if (row + min_row >= 0 and row + max_row < board_rows 
+            and col + min_col >= 0 and col + max_col < board_cols):
+            # the whole kernel is on the board
+            return targets
+        return [(target_row, target_col) 
+                for target_row, target_col in targets 
+                if (0 <= target_row < board_rows 
+                    and 0 <= target_col < board_cols)]
+
+    def end_turn(self, 
+                 progress: Optional[Callable[[int, int], None]] = None
+                 ) -> None:
         """
         Executes the attack and enemy movement phases, 
         then sets all mechs to be active.
@@ -1155,32 +2604,449 @@ class BreachModel():
                 no greater than it's speed)
             If no valid path, enemy does not move.
 
+        Parameter:
+            progress: passed on to move_enemies, if given.
+        """
+        with INSTRUMENTATION.span("end_turn"):
+            entities_list = self.get_entities()
+            moved_made = self._any_moved_made
+            self._begin_action()
+
+            # attack phase
+            with INSTRUMENTATION.span("end_turn.attack"):
+                for entity in entities_list:
+                    if entity.is_alive():
+                        self.make_attack(entity)
+                    else:
+                        self._remove_entity(entity)
+            
+                # double check to delete dead entities
+                for entity in entities_list:
+                    if not entity.is_alive():
+                        self._remove_entity(entity)
+            
+            # enemy movement phase
+            with INSTRUMENTATION.span("end_turn.assign_objectives"):
+                self.assign_objectives()
+            with INSTRUMENTATION.span("end_turn.move_enemies"):
+                self.move_enemies(progress)
+
+            # set mech to active
+            for entity in entities_list:
+                if entity.is_friendly():
+                    entity.enable()
+
+            self._any_moved_made = False
+            self._end_action(END_TURN_ACTION, moved_made)
+
+    def suggest_turn(self, 
+                     time_limit: Optional[float] = SOLVER_TIME_LIMIT
+                     ) -> list[tuple[int, tuple[int, int]]]:
+        """
+        Returns the best plan for the rest of this turn found by TurnSolver 
+        within the time limit, as the (entity handle, destination) of each 
+        mech move in the order to make them. An empty plan means ending 
+        the turn now is best. The game state is not changed.
+
+        Parameter:
+            time_limit: seconds to search for, or None to search until 
+                        the best plan is certain.
         """
-        entities_list = self.get_entities()
+        return TurnSolver(self).solve(time_limit)
 
-        # attack phase
-        for entity in entities_list:
-            if entity.is_alive():
-                self.make_attack(entity)
+
+class TurnSolver():
+    """
+    Finds the best moves for the mechs that have not moved yet this turn.
+
+    Every order of mech moves is searched, each mech moving to any of its 
+    valid movement positions or staying where it is, and every plan is 
+    scored by playing the end of turn that follows it on a fork of the 
+    model. A plan scores SOLVER_KILL_SCORE for each enemy killed, 
+    SOLVER_BUILDING_SCORE for each building left standing, and one point 
+    for each point of building and mech health left.
+
+    States reached by more than one order of moves are only searched once, 
+    and a branch is cut off once an upper bound on the score of any plan 
+    in it is no better than the best plan found.
+    """
+
+    def __init__(self, model: BreachModel) -> None:
+        """
+        Sets up a solver for the turn in progress in the given model.
+
+        Parameter:
+            model: the game state to plan from, which is never changed.
+        """
+        self._root = model.fork()
+        # forks of the root inherit the hash and keep it up to date
+        self._root.get_state_hash()
+        self._enemy_count = sum(not entity.is_friendly() 
+                                for entity in self._root.get_entities())
+        self._deadline = None
+        self._seen = set()
+        self._best_score = None
+        self._best_plan = []
+        # number of plans scored, and whether the last search finished
+        self.plans_scored = 0
+        self.complete = False
+
+    def solve(self, 
+              time_limit: Optional[float] = SOLVER_TIME_LIMIT
+              ) -> list[tuple[int, tuple[int, int]]]:
+        """
+        Searches for the best plan, as described in BreachModel.suggest_turn, 
+        returning the best one found so far once the time limit is up.
+
+        Parameter:
+            time_limit: seconds to search for, or None for no limit.
+        """
+        self._deadline = Deadline(time_limit)
+        self._seen = {self._root.get_state_hash()}
+        self._best_score = self._score(self._root)
+        self._best_plan = []
+        self.complete = self._search(self._root, [])
+        return list(self._best_plan)
+
+    def _search(self, 
+                model: BreachModel, 
+                plan: list[tuple[int, tuple[int, int]]]) -> bool:
+        """
+        Scores every plan that continues the given plan with one or more 
+        mech moves, keeping the best. Returns False iff the time ran out.
+
+        Parameters:
+            model: the state after the moves in plan.
+            plan: the moves made so far.
+        """
+        movers = [entity for entity in model.get_entities() 
+                  if entity.is_friendly() and entity.is_active() 
+                  and entity.is_alive()]
+        if self._get_bound(model, movers) <= self._best_score:
+            return True
+        for mech in movers:
+            entity_id = model.get_entity_id(mech)
+            for position in self._order_moves(model, mech):
+                if self._deadline.expired():
+                    return False
+                child = model.fork()
+                child.attempt_move(child.get_entity_by_id(entity_id), 
+                                   position)
+                state_hash = child.get_state_hash()
+                if state_hash in self._seen:
+                    # the same state was reached by moving in another order
+                    continue
+                self._seen.add(state_hash)
+                child_plan = plan + [(entity_id, position)]
+                score = self._score(child)
+                if score > self._best_score:
+                    self._best_score = score
+                    self._best_plan = child_plan
+                if len(movers) > 1 and not self._search(child, child_plan):
+                    return False
+        return True
+
+    def _order_moves(self, 
+                     model: BreachModel, 
+                     mech: Mech) -> list[tuple[int, int]]:
+        """
+        Returns the valid movement positions of the given mech, those from 
+        which it would deal the most damage to enemies first, so that good 
+        plans are found early and more branches can be cut off.
+        """
+        def damage_from(position: tuple[int, int]) -> int:
+            damage = 0
+            for target in model._get_attack_targets(mech, position):
+                occupant = model.get_entity_at(target)
+                if occupant is not None and not occupant.is_friendly():
+                    damage += mech.get_strength()
+            return damage
+
+        return sorted(model.get_valid_movement_positions(mech), 
+                      key=damage_from, reverse=True)
+
+    def _score(self, model: BreachModel) -> int:
+        """
+        Returns the score of ending the turn in the given state.
+        """
+        self.plans_scored += 1
+        result = model.fork()
+        # the end of turn is never hashed, so skip updating the hash
+        result._zobrist = None
+        result.end_turn()
+        enemies_left = 0
+        mech_health = 0
+        for entity in result.get_entities():
+            if not entity.is_friendly():
+                enemies_left += entity.is_alive()
             else:
-                entities_list.remove(entity)
-        
-        # double check to delete dead entities
-        for entity in entities_list:
+                mech_health += entity.get_health()
+        board = result.get_board()
+        return (SOLVER_KILL_SCORE * (self._enemy_count - enemies_left) 
+                + SOLVER_BUILDING_SCORE * board.get_standing_building_count()
+                + sum(board.get_health_array()) + mech_health)
+
+    def _get_bound(self, model: BreachModel, movers: list[Entity]) -> int:
+        """
+        Returns an upper bound on the score of any plan that continues 
+        from the given state, where movers are the mechs that may still move.
+
+        The bound assumes every building and mech survives the attack phase 
+        at its current health, plus the most every heal mech could heal, and 
+        that an enemy is killed whenever all the entities that could hit it 
+        together deal enough damage. A mech that may still move is counted 
+        as able to hit an enemy if some position within its speed of it, 
+        ignoring obstacles, would let it.
+        """
+        board = model.get_board()
+        score = (SOLVER_BUILDING_SCORE * board.get_standing_building_count() 
+                 + sum(board.get_health_array()))
+        mover_set = set(movers)
+        attackers = []
+        for entity in model.get_entities():
             if not entity.is_alive():
-                entities_list.remove(entity)
-        
-        # enemy movement phase
-                
-        self.assign_objectives()
-        self.move_enemies()
-
-        # set mech to active
-        for entity in entities_list:
+                continue
             if entity.is_friendly():
-                entity.enable()
+                score += entity.get_health()
+            strength = entity.get_strength()
+            if strength < 0:
+                # a heal lands on at most one building or mech per target
+                score -= strength * len(model._get_attack_kernel(entity)[0])
+            elif strength > 0:
+                attackers.append(entity)
+
+        kills = 0
+        for enemy in model.get_entities():
+            if enemy.is_friendly() or not enemy.is_alive():
+                continue
+            enemy_row, enemy_col = enemy.get_position()
+            damage = 0
+            for attacker in attackers:
+                if attacker is enemy:
+                    continue
+                if attacker not in mover_set:
+                    if (enemy.get_position() 
+                        in model._get_attack_targets(attacker)):
+                        damage += attacker.get_strength()
+                    continue
+                row, col = attacker.get_position()
+                for delta_row, delta_col in (
+                        model._get_attack_kernel(attacker)[0]):
+                    if (abs(enemy_row - delta_row - row) 
+                        + abs(enemy_col - delta_col - col) 
+                        <= attacker.get_speed()):
+                        damage += attacker.get_strength()
+                        break
+            if damage >= enemy.get_health():
+                kills += 1
+        return score + SOLVER_KILL_SCORE * kills
+
+
+# Entity classes by the symbol used for them in game files
+ENTITY_CLASSES = {
+    TANK_SYMBOL: TankMech,
+    HEAL_SYMBOL: HealMech,
+    SCORPION_SYMBOL: Scorpion,
+    FIREFLY_SYMBOL: Firefly
+}
+
+
+def parse_entity(line: str, board_dims: tuple[int, int]) -> Entity:
+    """
+    Returns the entity described by one line of a game file, in the same 
+    comma separated format as the string representation of an entity.
+
+    Parameters:
+        line: the entity line, without its line ending.
+        board_dims: (#rows, #columns) of the board the entity is placed on.
 
-        self._any_moved_made = False
+    Raises:
+        ValueError: if the line does not describe an entity on the board.
+    """
+    fields = [field.strip() for field in line.split(',')]
+    if len(fields) != 6:
+        raise ValueError(f"expected 6 comma separated fields "
+                         f"but found {len(fields)}")
+    entity_class = ENTITY_CLASSES.get(fields[0])
+    if entity_class is None:
+        raise ValueError(f"unknown entity symbol {fields[0]!r}")
+    try:
+        row, col, health, speed, strength = (int(field) 
+                                             for field in fields[1:])
+    except ValueError:
+        raise ValueError(f"entity values must be whole numbers: {line!r}")
+    if not (0 <= row < board_dims[0] and 0 <= col < board_dims[1]):
+        raise ValueError(f"position ({row}, {col}) is not on the board")
+    return entity_class((row, col), health, speed, strength)
+
+
+def load_breach_model(file_path: str) -> BreachModel:
+    """
+    Reads a game file and returns the BreachModel it describes, 
+    without needing a display.
+
+    A game file holds the string representation of a board, 
+    followed by a blank line, 
+    followed by one line per entity in descending priority order.
+    The file is read one line at a time straight into a CompactBoard, 
+    so large levels only need memory for the board and its entities.
+    Binary snapshots written by save_breach_model are detected and 
+    loaded too, as are action journals, which are loaded at their last 
+    recorded state (see load_journal).
+
+    Parameters:
+        file_path: path of the game file to read.
+
+    Raises:
+        IOError: if the file cannot be opened.
+        ValueError: if the file is malformed. The message gives the 
+                    offending line number.
+    """
+    with open(file_path, "rb") as game_file:
+        magic = game_file.read(max(len(SNAPSHOT_MAGIC), len(JOURNAL_MAGIC)))
+        if is_snapshot(magic):
+            game_file.seek(0)
+            try:
+                return BreachModel.from_snapshot(game_file.read())
+            except ValueError as error:
+                raise ValueError(f"{file_path}: {error}") from None
+    if is_journal(magic):
+        return load_journal(file_path)
+
+    game_board = CompactBoard([])
+    game_entities = []
+    # check for blank line separating board and entities
+    separate_line_check = False
+
+    with open(file_path, "r") as game_file:
+        for line_number, line in enumerate(game_file, start=1):
+            line = line.rstrip('\r\n')
+            try:
+                if not separate_line_check:
+                    if not line:
+                        separate_line_check = True
+                    else:
+                        game_board.add_row(line)
+                elif line.strip():
+                    game_entities.append(parse_entity(
+                        line, game_board.get_dimensions()))
+            except ValueError as error:
+                raise ValueError(f"{file_path}, line {line_number}: "
+                                 f"{error}") from None
+
+    if game_board.get_dimensions()[0] == 0:
+        raise ValueError(f"{file_path}: the game file has no board")
+    return BreachModel(game_board, game_entities)
+
+
+def save_breach_model(breach_model: BreachModel, file_path: str) -> None:
+    """
+    Saves a game state to a file that load_breach_model can read.
+
+    Files ending in SNAPSHOT_EXTENSION are written as compressed binary 
+    snapshots, which also keep which mechs have already moved. 
+    Any other file is written as the string representation of the model.
+
+    Parameters:
+        breach_model: the game state to save.
+        file_path: path of the file to write.
+    """
+    if file_path.endswith(SNAPSHOT_EXTENSION):
+        with open(file_path, "wb") as new_save:
+            new_save.write(breach_model.to_snapshot())
+        return
+
+    with open(file_path, "w") as new_save:
+        # writelines game_board
+        new_save.writelines(str(breach_model.get_board()))
+        #writeline a new line \n
+        new_save.write("\n\n")
+
+        #writelines game_entities
+        for entity in breach_model.get_entities():
+            new_save.write(str(entity) + "\n")
+
+
+def load_journal(file_path: str, 
+                 turn: Optional[int] = None, 
+                 replay_all: bool = False) -> BreachModel:
+    """
+    Returns a game state recorded in an action journal written by 
+    BreachModel.start_journal: the state at the start of the given turn, 
+    counting the first turn of the journal as turn 0, or the state after 
+    the last recorded action if turn is None.
+
+    The nearest checkpoint before that state is loaded and only the actions 
+    recorded after it are replayed, unless replay_all is set, in which case 
+    the whole game is replayed from the first checkpoint and every later 
+    checkpoint is checked against the replayed state. Every replayed end 
+    of turn is checked against the entity moves recorded for it, so a 
+    journal that no longer replays the same way shows where it diverges.
+
+    Parameters:
+        file_path: path of the journal file.
+        turn: the turn to stop at the start of, or None for the end.
+        replay_all: whether to replay from the start of the journal.
+
+    Raises:
+        IOError: if the file cannot be opened.
+        ValueError: if the journal is malformed, never reaches the given 
+                    turn, or replays differently from how it was recorded.
+    """
+    with open(file_path, "rb") as journal_file:
+        try:
+            records = read_journal(journal_file.read())
+        except ValueError as error:
+            raise ValueError(f"{file_path}: {error}") from None
+    if not records or records[0][0] != JOURNAL_CHECKPOINT:
+        raise ValueError(f"{file_path}: the journal has no checkpoint")
+
+    # the wanted state is the one after the record at index stop
+    stop = len(records) - 1
+    if turn is not None:
+        current_turn = None
+        for index, (kind, values) in enumerate(records):
+            if kind in (JOURNAL_CHECKPOINT, JOURNAL_END_TURN):
+                current_turn = values[0]
+            elif kind == JOURNAL_UNDO and values[0]:
+                current_turn -= 1
+            if current_turn == turn:
+                stop = index
+                break
+        else:
+            raise ValueError(f"{file_path}: the journal never reaches "
+                             f"turn {turn}")
+    # an undo followed by a checkpoint cannot be replayed from the 
+    # checkpoint before it, but gives the same state as the one after
+    if (stop + 1 < len(records) and records[stop][0] == JOURNAL_UNDO 
+        and records[stop + 1][0] == JOURNAL_CHECKPOINT):
+        stop += 1
+
+    start = 0
+    if not replay_all:
+        start = max(index for index in range(stop + 1) 
+                    if records[index][0] == JOURNAL_CHECKPOINT)
+    model = _load_checkpoint(records[start][1])
+    for index in range(start + 1, stop + 1):
+        kind, values = records[index]
+        try:
+            model._replay_record(kind, values)
+        except ValueError as error:
+            raise ValueError(f"{file_path}, record {index}: {error}") from None
+    return model
+
+
+def _load_checkpoint(values: tuple) -> BreachModel:
+    """
+    Returns the game state stored in the values of a journal checkpoint, 
+    with every entity given its recorded handle.
+    """
+    _, next_entity_id, entity_ids, snapshot = values
+    model = BreachModel.from_snapshot(snapshot)
+    if len(entity_ids) != len(model.get_entities()):
+        raise ValueError("checkpoint handles do not match its entities")
+    model._set_entity_ids(entity_ids, next_entity_id)
+    return model
 
 
 # GUI COMPONENTS BELOW
@@ -1198,17 +3064,347 @@ class GameGrid(AbstractGrid):
             Annotating building health on top of buildings.
         4. Do not bind any commands to mouse buttons at this stage. 
             This will be done when working on the controller.
+
+    The grid is a viewport onto the board that can be scrolled and zoomed. 
+    Canvas items are only created for the cells in view, tagged by their 
+    place in the viewport, and reused as the view pans: a cell's items are 
+    only reconfigured when what it shows changes.
     """
 
+    def __init__(self, 
+                 master: tk.Widget, 
+                 dimensions: tuple[int, int], 
+                 size: tuple[int, int], 
+                 **kwargs) -> None:
+        """
+        Constructor of the GameGrid class, inherits from AbstractGrid.
+
+        Parameters:
+            master: The master frame for this Canvas.
+            dimensions: (#rows, #columns)
+            size: (width in pixels, height in pixels)
+            **kwargs: keyword arguments.
+        """
+        super().__init__(master, dimensions, size, **kwargs)
+        self._board = None
+        # zoom factor, and the (row, col) of the top left cell in view
+        self._zoom = 1.0
+        self._origin = (0, 0)
+        self._reset_cells()
+
+        # scroll with the mouse wheel, sideways while holding shift, 
+        # and zoom while holding control
+        self._bind_wheel("", lambda step: self.scroll(step * SCROLL_STEP, 0))
+        self._bind_wheel("Shift-", 
+                         lambda step: self.scroll(0, step * SCROLL_STEP))
+        self._bind_wheel("Control-", lambda step: self.zoom(-step))
+
+    def _bind_wheel(self, 
+                    modifier: str, 
+                    action: Callable[[int], None]) -> None:
+        """
+        Binds the mouse wheel, with the given modifier held, to call action 
+        with -1 when scrolled up and 1 when scrolled down.
+        Windows and Mac send MouseWheel events, X11 sends Button-4 and 5.
+
+        Parameters:
+            modifier: event modifier prefix, such as "Shift-", or "".
+            action: function taking the scroll direction.
+        """
+        self.bind(f"<{modifier}MouseWheel>", 
+                  lambda event: action(-1 if event.delta > 0 else 1))
+        self.bind(f"<{modifier}Button-4>", lambda event: action(-1))
+        self.bind(f"<{modifier}Button-5>", lambda event: action(1))
+
+    def _reset_cells(self) -> None:
+        """
+        Forgets every cell drawn on the canvas.
+        """
+        # cell size and viewport size the items were created for, 
+        # and the board and origin they were last drawn from
+        self._cell_layout = None
+        self._cell_board = None
+        self._cell_origin = None
+        # rectangle and text item ids, and the (color, text) shown, 
+        # of each place in the viewport by row * view cols + col
+        self._cell_rects = []
+        self._cell_texts = []
+        self._cell_states = []
+        # cells that may differ from the plain board: 
+        # the last highlighted, occupied, shaded and hinted positions
+        self._drawn_highlights = set()
+        self._drawn_occupants = set()
+        self._drawn_danger = {}
+        self._drawn_hint = set()
+
+    def clear(self) -> None:
+        """
+        Clears all items off the canvas, so that every cell is created 
+        again on the next redraw.
+        """
+        super().clear()
+        self._reset_cells()
+
+    def _get_cell_size(self) -> tuple[int, int]:
+        """
+        Returns the size of the cells (width, height) in pixels at the 
+        current zoom. Unzoomed, the board fits the grid unless that would 
+        make cells smaller than MIN_CELL_SIZE.
+        """
+        rows, cols = self._dimensions
+        width, height = self._size
+        cell_width = max(width // cols, MIN_CELL_SIZE)
+        cell_height = max(height // rows, MIN_CELL_SIZE)
+        return (max(1, round(cell_width * self._zoom)), 
+                max(1, round(cell_height * self._zoom)))
+
+    def _get_view_size(self) -> tuple[int, int]:
+        """
+        Returns the number of (rows, cols) of cells in view, 
+        counting cells that are only partly visible at the edges.
+        """
+        rows, cols = self._dimensions
+        width, height = self._size
+        cell_width, cell_height = self._get_cell_size()
+        return (min(rows, (height + cell_height - 1) // cell_height), 
+                min(cols, (width + cell_width - 1) // cell_width))
+
+    def _get_max_origin(self) -> tuple[int, int]:
+        """
+        Returns the furthest (row, col) the top left cell in view can be, 
+        where the bottom right cell of the board is fully visible.
+        """
+        rows, cols = self._dimensions
+        width, height = self._size
+        cell_width, cell_height = self._get_cell_size()
+        return (max(0, rows - height // cell_height), 
+                max(0, cols - width // cell_width))
+
+    def _get_bbox(self, 
+                  position: tuple[int, int]) -> tuple[int, int, int, int]:
+        """
+        Returns the bounding box of the given (row, col) position 
+        within the viewport.
+        """
+        top, left = self._origin
+        return super()._get_bbox((position[0] - top, position[1] - left))
+
+    def _get_midpoint(self, position: tuple[int, int]) -> tuple[int, int]:
+        """
+        Returns the pixel position of the center of the cell at the given 
+        (row, col) position within the viewport.
+        """
+        top, left = self._origin
+        return super()._get_midpoint((position[0] - top, position[1] - left))
+
+    def pixel_to_cell(self, x: int, y: int) -> tuple[int, int]:
+        """
+        Converts a pixel position on the canvas to the (row, col) position 
+        of the board cell shown there, at the current scroll and zoom.
+
+        Parameters:
+            x: The x pixel position.
+            y: The y pixel position.
+        """
+        row, col = super().pixel_to_cell(x, y)
+        top, left = self._origin
+        return row + top, col + left
+
+    def _get_font(self) -> tuple[str, int, str]:
+        """
+        Returns ENTITY_FONT, made smaller if the cells are too small for it.
+        """
+        family, size, weight = ENTITY_FONT
+        size = min(size, max(1, min(self._get_cell_size()) // 2))
+        return family, size, weight
+
+    def scroll(self, rows: int, cols: int) -> None:
+        """
+        Pans the view by the given number of cells, staying on the board, 
+        and redraws the grid.
+
+        Parameters:
+            rows: rows to pan down by, or up by if negative.
+            cols: columns to pan right by, or left by if negative.
+        """
+        max_top, max_left = self._get_max_origin()
+        top, left = self._origin
+        self._origin = (min(max(top + rows, 0), max_top), 
+                        min(max(left + cols, 0), max_left))
+        self._render()
+
+    def zoom(self, steps: int) -> None:
+        """
+        Zooms in by the given number of ZOOM_STEP steps, or out if negative, 
+        keeping the cell in the center of the view in place, and redraws 
+        the grid. The board can not be zoomed out past fitting the grid, 
+        or zoomed in past one cell filling it.
+
+        Parameter:
+            steps: number of zoom steps.
+        """
+        rows, cols = self._dimensions
+        width, height = self._size
+        center = self.pixel_to_cell(width // 2, height // 2)
+        max_zoom = max(1.0, min(width / max(width // cols, MIN_CELL_SIZE), 
+                                height / max(height // rows, MIN_CELL_SIZE)))
+        self._zoom = min(max(self._zoom * ZOOM_STEP ** steps, 1.0), max_zoom)
+
+        cell_width, cell_height = self._get_cell_size()
+        self._origin = (center[0] - height // 2 // cell_height, 
+                        center[1] - width // 2 // cell_width)
+        self.scroll(0, 0)
+
+    def _get_entity_display(self, entity: Entity) -> str:
+        """
+        Returns the special Unicode character displayed for the entity.
+        """
+        if isinstance(entity, TankMech):
+            return TANK_DISPLAY
+        if isinstance(entity, HealMech):
+            return HEAL_DISPLAY
+        if isinstance(entity, Scorpion):
+            return SCORPION_DISPLAY
+        if isinstance(entity, Firefly):
+            return FIREFLY_DISPLAY
+        return ''
+
+    def _get_cell_state(self, 
+                        position: tuple[int, int], 
+                        occupant: Optional[Entity]) -> tuple[str, str]:
+        """
+        Returns the (color, text) that the cell at the given position 
+        should display.
+
+        Parameters:
+            position: (row, col) of the cell.
+            occupant: the entity drawn on the cell, or None.
+        """
+        tile = self._board.get_tile(position)
+        highlighted = position in self._highlighted
+        if highlighted and self._movement:
+            highlight_color = ATTACK_COLOR
+        elif highlighted:
+            highlight_color = MOVE_COLOR
+        elif position in self._hint:
+            highlight_color = HINT_COLOR
+        else:
+            highlight_color = None
+
+        text = ''
+        in_danger = position in self._danger
+        if isinstance(tile, Building):
+            # is the Building destroyed? set color accordingly
+            if tile.is_destroyed():
+                shaded = in_danger and highlight_color is None
+                color = DANGER_COLOR if shaded else DESTROYED_COLOR
+            elif highlight_color is not None:
+                color = highlight_color
+                text = str(tile)
+            else:
+                color = DANGER_COLOR if in_danger else BUILDING_COLOR
+                text = str(tile)
+        elif highlight_color is not None:
+            color = highlight_color
+        elif isinstance(tile, Mountain):
+            color = MOUNTAIN_COLOR
+        else:
+            color = DANGER_COLOR if in_danger else GROUND_COLOR
+
+        if occupant is not None:
+            # entity highlighted for target
+            if highlighted and self._movement:
+                color = ATTACK_COLOR
+            text = self._get_entity_display(occupant)
+        return color, text
+
+    def _get_slot_state(self, 
+                        position: tuple[int, int], 
+                        occupants: dict[tuple[int, int], Entity]
+                        ) -> tuple[Optional[str], str]:
+        """
+        Returns the (color, text) of the viewport place showing the given 
+        position, with a color of None if the position is off the board.
+        """
+        rows, cols = self._dimensions
+        if position[0] >= rows or position[1] >= cols:
+            return None, ''
+        return self._get_cell_state(position, occupants.get(position))
+
+    def _create_cells(self, 
+                      occupants: dict[tuple[int, int], Entity]) -> None:
+        """
+        Deletes every canvas item, then creates a rectangle and a text item 
+        for every place in the viewport, showing the cells in view.
+
+        Parameter:
+            occupants: the entity drawn on each occupied position.
+        """
+        self.clear()
+        self._cell_layout = (self._get_cell_size(), self._get_view_size())
+        self._cell_board = self._board
+        self._cell_origin = self._origin
+        view_rows, view_cols = self._cell_layout[1]
+        top, left = self._origin
+        font = self._get_font()
+        for row in range(top, top + view_rows):
+            for col in range(left, left + view_cols):
+                position = (row, col)
+                color, text = self._get_slot_state(position, occupants)
+                tag = f"slot{row - top},{col - left}"
+                self._cell_rects.append(self.create_rectangle(
+                    *self._get_bbox(position), fill=color or '', 
+                    state=tk.NORMAL if color else tk.HIDDEN, 
+                    tags=("tile", tag)))
+                self._cell_texts.append(self.create_text(
+                    self._get_midpoint(position), text=text, 
+                    font=font, tags=("annotation", tag)))
+                self._cell_states.append((color, text))
+
+    def _update_cells(self, 
+                      positions: set[tuple[int, int]], 
+                      occupants: dict[tuple[int, int], Entity]) -> None:
+        """
+        Reconfigures the items showing each given position that is in view, 
+        if its color or text has changed since it was last drawn.
+
+        Parameters:
+            positions: the cells that may have changed.
+            occupants: the entity drawn on each occupied position.
+        """
+        view_rows, view_cols = self._cell_layout[1]
+        top, left = self._origin
+        for position in positions:
+            row, col = position[0] - top, position[1] - left
+            if not (0 <= row < view_rows and 0 <= col < view_cols):
+                continue
+            index = row * view_cols + col
+            color, text = self._get_slot_state(position, occupants)
+            old_color, old_text = self._cell_states[index]
+            if color != old_color and color is None:
+                self.itemconfig(self._cell_rects[index], state=tk.HIDDEN)
+            elif color != old_color and old_color is None:
+                self.itemconfig(self._cell_rects[index], fill=color, 
+                                state=tk.NORMAL)
+            elif color != old_color:
+                self.itemconfig(self._cell_rects[index], fill=color)
+            if text != old_text:
+                self.itemconfig(self._cell_texts[index], text=text)
+            self._cell_states[index] = (color, text)
+
+    @INSTRUMENTATION.timed("redraw.game_grid")
     def redraw(self, 
                board: Board, 
                entities: list[Entity], 
                highlighted: list[tuple[int, int]] = None, 
-               movement: bool = False ) -> None:
+               movement: bool = False,
+               danger: Optional[dict[tuple[int, int], int]] = None, 
+               hint: Optional[list[tuple[int, int]]] = None) -> None:
         """
-        Clears the game grid, then redraws it 
-        according to the provided information.
+        Updates the game grid according to the provided information.
         Draw on gamegrid instance itself, not directly onto master or others.
+        Only the cells in view are drawn, and only those whose color, 
+        highlight, building health or occupant changed are reconfigured.
         
         If a list of highlighted cells are provided, then the color of 
         those cells are overridden to be one of two highlight colors based on 
@@ -1234,104 +3430,78 @@ class GameGrid(AbstractGrid):
             highlighted: coordinates of hightlighed grids.
             movement: False for next display being movement display,
                       True for next display being range of attack display.
+            danger: positions enemies would attack next, from 
+                    BreachModel.get_danger_map, shaded with DANGER_COLOR 
+                    unless highlighted or a mountain. None for no shading.
+            hint: positions of a suggested move, colored HINT_COLOR 
+                  unless highlighted. None for no hint.
         """
         self._board = board
         
         self._entities = entities
-        #possible move or target
-        self._highlighted = highlighted
+        self._danger = danger or {}
+        self._hint = set(hint or ())
+        #possible move or target, as a set for fast membership tests
+        self._highlighted = set(highlighted or ())
         # False for movement display, True for target display
         self._movement = movement 
 
-        # retrieve the dimensions and store (row, col) separately
-        board_rows, board_cols = self._board.get_dimensions()
+        # later entities are drawn on top of earlier ones
+        occupants = {}
+        for entity in self._entities:
+            occupants[entity.get_position()] = entity
 
-        # Clear the grid
-        self.clear()
+        if board.get_dimensions() != self._dimensions:
+            # a new board is shown from its top left, unzoomed
+            self.set_dimensions(board.get_dimensions())
+            self._zoom = 1.0
+            self._origin = (0, 0)
+        self._render(occupants)
 
-        # set dimensions
-        self.set_dimensions((board_rows, board_cols))
+    def _render(self, 
+                occupants: Optional[dict[tuple[int, int], Entity]] = None
+                ) -> None:
+        """
+        Brings the cells in view up to date with the last redraw.
 
-        # Draw tiles
-        for row in range(board_rows):
-            for col in range(board_cols):
-                tile = self._board.get_tile((row, col))
-                # tile is highlighted for possible movement display
-                if not self._movement and (row, col) in self._highlighted:
-                    # is the tile a building?
-                    if isinstance(tile, Building):
-                        # is the Building destroyed? set color accordingly
-                        if tile.is_destroyed():
-                            color = DESTROYED_COLOR
-                        else:
-                            color = MOVE_COLOR
-                        self.color_cell((row, col), color)
-                        if not tile.is_destroyed():
-                            self.annotate_position((row, col),
-                                                   str(tile),
-                                                   ENTITY_FONT)
-                    # is the tile either a Mountain or a Ground?
-                    if isinstance(tile, Mountain) or isinstance(tile, Ground):
-                        self.color_cell((row, col), MOVE_COLOR)
-                # tile is highlighted for attack range
-                elif self._movement and (row, col) in self._highlighted:
-                    # is the tile a Building?
-                    if isinstance(tile, Building):
-                        # is the Building destroyed? set color accordingly
-                        if tile.is_destroyed():
-                            color = DESTROYED_COLOR
-                        else:
-                            color = ATTACK_COLOR
-                        self.color_cell((row, col), color)
-                        if not tile.is_destroyed():
-                            self.annotate_position((row, col),
-                                                   str(tile),
-                                                   ENTITY_FONT)
-                    # is the tile either a Mountain or a Ground?
-                    if isinstance(tile, Mountain) or isinstance(tile, Ground):
-                        self.color_cell((row, col), ATTACK_COLOR)
-                # tile is not highlighted
-                elif (row, col) not in self._highlighted:
-                    # is the tile a Building?
-                    if isinstance(tile, Building):
-                        if tile.is_destroyed():
-                            color = DESTROYED_COLOR
-                        else:
-                            color = BUILDING_COLOR
-                        self.color_cell((row, col), color)
-                        if not tile.is_destroyed():
-                            self.annotate_position((row, col),
-                                                   str(tile),
-                                                   ENTITY_FONT)
-                    # is the tile either a Mountain?
-                    elif isinstance(tile, Mountain):
-                        self.color_cell((row, col), MOUNTAIN_COLOR)
-                    # is the tile either a Ground?
-                    elif isinstance(tile, Ground):
-                        self.color_cell((row, col), GROUND_COLOR)
-        
-        # Draw entities
-        for entity in self._entities:
-            pos = entity.get_position()
-            # entity highlighted for target
-            if self._movement and pos in self._highlighted:
-                self.color_cell(pos, ATTACK_COLOR)
-            if isinstance(entity, TankMech):
-                self.annotate_position(pos, 
-                                        TANK_DISPLAY, 
-                                        ENTITY_FONT)
-            if isinstance(entity, HealMech):
-                self.annotate_position(pos, 
-                                        HEAL_DISPLAY, 
-                                        ENTITY_FONT)
-            if isinstance(entity, Scorpion):
-                self.annotate_position(pos, 
-                                        SCORPION_DISPLAY, 
-                                        ENTITY_FONT)
-            if isinstance(entity, Firefly):
-                self.annotate_position(pos, 
-                                        FIREFLY_DISPLAY, 
-                                        ENTITY_FONT)
+        Parameter:
+            occupants: the entity drawn on each occupied position, 
+                       or None to find them from the entities.
+        """
+        if self._board is None:
+            return
+        if occupants is None:
+            occupants = {}
+            for entity in self._entities:
+                occupants[entity.get_position()] = entity
+
+        board = self._board
+        layout = (self._get_cell_size(), self._get_view_size())
+        if layout != self._cell_layout:
+            self._create_cells(occupants)
+        elif board is not self._cell_board or self._origin != self._cell_origin:
+            # the view has panned, so every place may show a new cell
+            view_rows, view_cols = layout[1]
+            top, left = self._origin
+            self._update_cells({(row, col) 
+                                for row in range(top, top + view_rows) 
+                                for col in range(left, left + view_cols)}, 
+                               occupants)
+            self._cell_board = board
+            self._cell_origin = self._origin
+        else:
+            # ground and mountains never change, so only cells that are or 
+            # were highlighted or occupied, and buildings, can differ
+            self._update_cells(self._drawn_highlights | self._highlighted 
+                               | self._drawn_occupants | occupants.keys()
+                               | (self._drawn_danger.keys() 
+                                  ^ self._danger.keys())
+                               | self._drawn_hint | self._hint
+                               | board.get_buildings().keys(), occupants)
+        self._drawn_highlights = self._highlighted
+        self._drawn_occupants = set(occupants)
+        self._drawn_danger = self._danger
+        self._drawn_hint = self._hint
 
     def bind_click_callback(self, 
                             click_callback: 
@@ -1379,6 +3549,7 @@ class SideBar(AbstractGrid):
         """
         super().__init__(master, dimensions, size)
         
+    @INSTRUMENTATION.timed("redraw.sidebar")
     def display(self, entities: list[Entity]) -> None:
         """
         Clears the side bar, then redraws the header followed 
@@ -1444,8 +3615,9 @@ class ControlBar(tk.Frame):
     """
     Tkinter Frame Class
 
-    Contains three buttons 
-    that allow the user to perform administration actions.
+    Contains five buttons 
+    that allow the user to perform administration actions, 
+    and a toggle for the danger shading.
     """
     def __init__(self, master: tk.Widget, **kwargs):
         """
@@ -1475,6 +3647,15 @@ class ControlBar(tk.Frame):
             side = tk.LEFT,
             expand = tk.TRUE
         )
+        # create undo move button
+        self.undo_btn = tk.Button(
+            self,
+            text = UNDO_TEXT
+        )
+        self.undo_btn.pack(
+            side = tk.LEFT,
+            expand = tk.TRUE
+        )
         # create end turn button
         self.end_turn_btn = tk.Button(
             self,
@@ -1484,6 +3665,24 @@ class ControlBar(tk.Frame):
             side = tk.LEFT,
             expand = tk.TRUE
         )
+        # create suggest move button
+        self.hint_btn = tk.Button(
+            self,
+            text = HINT_TEXT
+        )
+        self.hint_btn.pack(
+            side = tk.LEFT,
+            expand = tk.TRUE
+        )
+        # create show danger toggle
+        self.danger_btn = tk.Checkbutton(
+            self,
+            text = DANGER_TEXT
+        )
+        self.danger_btn.pack(
+            side = tk.LEFT,
+            expand = tk.TRUE
+        )
 
 
 # View class
@@ -1493,7 +3692,11 @@ class BreachView():
                  board_dims: tuple[int, int], 
                  save_callback: Optional[Callable[[], None]] = None,
                  load_callback: Optional[Callable[[], None]] = None, 
-                 turn_callback: Optional[Callable[[], None]] = None ) -> None:
+                 turn_callback: Optional[Callable[[], None]] = None,
+                 undo_callback: Optional[Callable[[], None]] = None,
+                 danger_callback: Optional[Callable[[], None]] = None,
+                 hint_callback: Optional[Callable[[], None]] = None
+                 ) -> None:
         """
         Constructor of BreachView class.
 
@@ -1503,6 +3706,9 @@ class BreachView():
             save_callback: save command method name as a reference.
             load_callback: load command method name as a reference.
             turn_callback: end turn command method name as a reference.
+            undo_callback: undo move command method name as a reference.
+            danger_callback: show danger toggle method name as a reference.
+            hint_callback: suggest move command method name as a reference.
 
         """
         self.root = root
@@ -1511,6 +3717,9 @@ class BreachView():
         self._save_callback = save_callback
         self._load_callback = load_callback
         self._turn_callback = turn_callback
+        self._undo_callback = undo_callback
+        self._danger_callback = danger_callback
+        self._hint_callback = hint_callback
 
         # check if player made a move
         self.moved = False
@@ -1527,12 +3736,12 @@ class BreachView():
             side=tk.TOP
         )
         # banner text
-        banner = tk.Label(
+        self._banner = tk.Label(
             bannerFrame,
             text = BANNER_TEXT, # "Into The Breach"
             font = BANNER_FONT, # "Arial", 22, "bold"
         )
-        banner.pack(
+        self._banner.pack(
         )
         #MIDDLE FRAMAE
         midFrame = tk.Frame(
@@ -1599,7 +3808,43 @@ class BreachView():
         self._controlbar.save_game_btn.config(command=self._save_callback)
         self._controlbar.load_game_btn.config(command=self._load_callback)
         self._controlbar.end_turn_btn.config(command=self._turn_callback)
+        self._controlbar.undo_btn.config(command=self._undo_callback)
+        self._controlbar.danger_btn.config(command=self._danger_callback)
+        self._controlbar.hint_btn.config(command=self._hint_callback)
+
+        # pan the game grid with the arrow keys, and zoom with + and -
+        self.root.bind("<Up>", lambda event: self._gamegrid.scroll(-1, 0))
+        self.root.bind("<Down>", lambda event: self._gamegrid.scroll(1, 0))
+        self.root.bind("<Left>", lambda event: self._gamegrid.scroll(0, -1))
+        self.root.bind("<Right>", lambda event: self._gamegrid.scroll(0, 1))
+        self.root.bind("<plus>", lambda event: self._gamegrid.zoom(1))
+        self.root.bind("<equal>", lambda event: self._gamegrid.zoom(1))
+        self.root.bind("<minus>", lambda event: self._gamegrid.zoom(-1))
         
+    def set_banner_text(self, text: str = BANNER_TEXT) -> None:
+        """
+        Shows the given text in the banner, or the game title if none given.
+
+        Parameter:
+            text: the text to show.
+        """
+        self._banner.config(text=text)
+
+    def set_controls_enabled(self, enabled: bool) -> None:
+        """
+        Enables or disables every button in the ControlBar.
+
+        Parameter:
+            enabled: True to enable the buttons, False to disable them.
+        """
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for button in (self._controlbar.save_game_btn, 
+                       self._controlbar.load_game_btn, 
+                       self._controlbar.undo_btn, 
+                       self._controlbar.end_turn_btn, 
+                       self._controlbar.hint_btn):
+            button.config(state=state)
+
     def bind_click_callback(self, 
                             click_callback: 
                             Callable[[tuple[int, int]], None]) -> None:
@@ -1618,7 +3863,9 @@ class BreachView():
     def redraw(self, board: Board, 
                entities: list[Entity], 
                highlighted: list[tuple[int,int]] = None, 
-               movement: bool = False ) -> None:
+               movement: bool = False,
+               danger: Optional[dict[tuple[int, int], int]] = None, 
+               hint: Optional[list[tuple[int, int]]] = None) -> None:
         """
         Redraws the instantiated GameGrid and SideBar 
         based on the given board, list of entities, 
@@ -1635,6 +3882,8 @@ class BreachView():
                         highlighted grids.
             movement: False for next display being movement display,
                       True for next display being range of attack display.
+            danger: the danger map to shade, or None for no shading.
+            hint: the positions of a suggested move, or None for no hint.
         """
         # the highlighted argument contains the selected entity
 
@@ -1642,7 +3891,9 @@ class BreachView():
         self._gamegrid.redraw(board,
                               entities,
                               highlighted,
-                              movement)
+                              movement,
+                              danger,
+                              hint)
         # display sidebar
         self._sidebar.display(entities)
 
@@ -1660,7 +3911,10 @@ class IntoTheBreach():
     on the board, using the set_focussed_entity method.
     """
 
-    def __init__(self, root: tk.Tk, game_file: str) -> None:
+    def __init__(self, 
+                 root: tk.Tk, 
+                 game_file: str, 
+                 journal_file: Optional[str] = None) -> None:
         """
         Constructor of controller class IntoTheBreach.
         Instantiates the controller. 
@@ -1670,10 +3924,16 @@ class IntoTheBreach():
         Parameters:
             root: The root frame of this Canvas.
             game_file: 1 out of the 3 pre-set game file.
+            journal_file: if given, every game played is journaled to this 
+                          file, which is restarted whenever a game is loaded.
         """
         # Store a reference to the root window
         self.root = root
 
+        # action journal of the game in play, see BreachModel.start_journal
+        self.journal_file = journal_file
+        self.breachModel = None
+
         # get the desired game txt file directory
         self.game_file = game_file 
         
@@ -1684,7 +3944,8 @@ class IntoTheBreach():
 
         # entities related variablesload
         self.game_entities = []
-        self.coord_highlighted_entity = []
+        # handle of the focussed entity from BreachModel.get_entity_id
+        self.focussed_entity_id = None
         self.number_of_entities = None
 
         # load game file path and content, 
@@ -1695,6 +3956,21 @@ class IntoTheBreach():
         # False for moving, True for attacking
         self.moving_attacking = False
 
+        # render scheduling: the id of the pending after_idle redraw, 
+        # and counts of the frames drawn and the redraw requests merged 
+        # into an already pending frame
+        self._pending_redraw = None
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        # the end of turn being played in the background, if any
+        self._end_turn_task = None
+        # the search for a suggested move running in the background, if any, 
+        # and the (model, version, positions) of the last suggestion
+        self._hint_task = None
+        self._hint = None
+        # whether the danger map is shaded
+        self.show_danger = False
+
         # create instance of BreachModel class (Model)
         # self.breachModel = BreachModel(self.game_board, 
         #                               self.game_entities)
@@ -1703,28 +3979,76 @@ class IntoTheBreach():
                                      self.game_board_dims,
                                       self._save_game,
                                       self._load_game,
-                                      self._end_turn
+                                      self._end_turn,
+                                      self._undo,
+                                      self._toggle_danger,
+                                      self._suggest_turn
                                       )
         self.breachView.bind_click_callback(self._handle_click)
         # mouse click passing event.x and event.y as pixels
         # self.breachView._gamegrid.bind('<Button-1>', self._handle_click)
 
         # redraw the gamegrid and sidebar
-        self.redraw() 
+        self.schedule_redraw()
+
+    def schedule_redraw(self) -> None:
+        """
+        Marks the view as needing a redraw. The redraw happens once the 
+        event loop is idle, so every request made while handling a burst 
+        of events is drawn as a single frame.
+        """
+        if self._pending_redraw is None:
+            self._pending_redraw = self.root.after_idle(self._draw_frame)
+        else:
+            self.frames_skipped += 1
+
+    def flush_redraw(self) -> None:
+        """
+        Draws the pending frame now, if there is one, 
+        for when the view must be up to date before blocking on a dialog.
+        """
+        if self._pending_redraw is not None:
+            self.root.after_cancel(self._pending_redraw)
+            self._draw_frame()
+
+    def _draw_frame(self) -> None:
+        """
+        Draws the frame scheduled by schedule_redraw.
+        """
+        self._pending_redraw = None
+        self.frames_drawn += 1
+        self.redraw()
         
     def redraw(self) -> None:
         """
         Redraws the instantiated GameGrid and SideBar based on 
-        the given board, list of entities, and tile highlight information.
+        the given board, list of entities, and tile highlight information, 
+        shading the danger map if it is shown.
         """
         # call breachView to call gamegrid.redraw() and sidebar.display()
 
-        # self.coord_highlighted_entity is the pos of focussed_entity
+        danger = None
+        if self.show_danger:
+            danger = self.breachModel.get_danger_map()
+
+        # a suggestion only holds until the game state changes
+        hint = None
+        if self._hint is not None:
+            model, version, positions = self._hint
+            if (model is self.breachModel 
+                and version == self.breachModel.get_version()):
+                hint = positions
+            else:
+                self._hint = None
+                self.breachView.set_banner_text()
+
+        # self.focussed_entity_id is the handle of focussed_entity
+        selected_entity = None
+        if self.focussed_entity_id is not None:
+            selected_entity = (self.breachModel.get_entity_by_id
+                               (self.focussed_entity_id))
 
-        if self.coord_highlighted_entity:
-            entity_pos = self.coord_highlighted_entity[0]
-            selected_entity = (self.breachModel.entity_positions()
-                             [entity_pos])
+        if selected_entity is not None:
             # entity is friendly and is going to move
             if selected_entity.is_friendly() and not self.moving_attacking:
                 possible_move_of_selected_entity = (self.breachModel.
@@ -1732,28 +4056,36 @@ class IntoTheBreach():
                                                  (selected_entity))
                 self.breachView.redraw(self.game_board,
                                        self.game_entities,
-                                       possible_move_of_selected_entity)
+                                       possible_move_of_selected_entity,
+                                       danger=danger,
+                                       hint=hint)
             # entity is friendly and is going to attack or
             # entity is not friendly
             elif not selected_entity.is_friendly():
-                attack_range = selected_entity.get_targets()
+                attack_range = self.breachModel.get_targets(selected_entity)
                 self.breachView.redraw(self.game_board,
                                        self.game_entities,
                                        attack_range,
-                                       self.moving_attacking)
+                                       self.moving_attacking,
+                                       danger,
+                                       hint)
             elif selected_entity.is_friendly() and self.moving_attacking:
-                attack_range = selected_entity.get_targets()
+                attack_range = self.breachModel.get_targets(selected_entity)
                 self.breachView.redraw(self.game_board,
                                        self.game_entities,
                                        attack_range,
-                                       self.moving_attacking)
+                                       self.moving_attacking,
+                                       danger,
+                                       hint)
         else:
             # deselect - passing an empty list to clear the highlighting tile
             # looks very hardcoding
             self.breachView.redraw(self.game_board,
                                    self.game_entities,
                                    [],
-                                   self.moving_attacking)
+                                   self.moving_attacking,
+                                   danger,
+                                   hint)
        
     def set_focussed_entity(self, 
                             entity: Optional[Entity]) -> None:
@@ -1764,14 +4096,14 @@ class IntoTheBreach():
         This method sets selected entity, disregards it being friendly or not.
 
         Parameter:
-            entity: position (row, col) of a selected entity instance. 
+            entity: a selected entity instance. 
                     If None is being passed in, no entity on the board 
                     is selected.
         """
         if entity is None:
-            self.coord_highlighted_entity = []
+            self.focussed_entity_id = None
         else:
-            self.coord_highlighted_entity.append(entity.get_position())
+            self.focussed_entity_id = self.breachModel.get_entity_id(entity)
 
     def make_move(self, 
                   position: tuple[int, int]) -> None:
@@ -1786,8 +4118,8 @@ class IntoTheBreach():
             position: target position (#rows, #cols) 
                         the user wants to move the entity to.
         """
-        focussed_entity = (self.breachModel.entity_positions()
-                           [self.coord_highlighted_entity[0]])
+        focussed_entity = (self.breachModel.get_entity_by_id
+                           (self.focussed_entity_id))
         focussedEntityValidPos = (self.breachModel.get_valid_movement_positions
                                      (focussed_entity))
         # ensure Mech can only move to possible move
@@ -1795,7 +4127,7 @@ class IntoTheBreach():
             self.breachModel.attempt_move(focussed_entity, position)
             self.moving_attacking = True
         # clear the entity selection
-        self.coord_highlighted_entity = self.set_focussed_entity(None)
+        self.set_focussed_entity(None)
 
 
     def load_model(self, 
@@ -1816,81 +4148,28 @@ class IntoTheBreach():
             explaining the error that occurred, 
             and the game state should not change.
         """
-        game_board = []
-        game_str_entities = []
-        # check for new line character for separating board and entities
-        separate_line_check = False
-
-        with open(file_path, "r") as game_file:
-            for line in game_file:
-                if not separate_line_check:
-                    if line == '\n':
-                        separate_line_check = True
-                        continue
-                    board_row = []
-                    for char in line.strip():
-                        board_row.append(char)
-                    game_board.append(board_row)
-                else:
-                    entity_row = []
-                    for char in line.strip():
-                        if char != ',':
-                            entity_row.append(char)
-                    game_str_entities.append(entity_row)
+        breach_model = load_breach_model(file_path)
+        if self.journal_file is not None:
+            if self.breachModel is not None:
+                self.breachModel.stop_journal()
+            breach_model.start_journal(self.journal_file)
         
-        # assign read lines to game board status
-        board_instance = Board(game_board)
-        self.game_board = board_instance
-        self.game_board_width = board_instance.get_dimensions()[1]
-        self.game_board_height = board_instance.get_dimensions()[0]
+        # assign loaded game state to the controller
+        self.breachModel = breach_model
+        self.game_board = breach_model.get_board()
+        self.game_board_width = self.game_board.get_dimensions()[1]
+        self.game_board_height = self.game_board.get_dimensions()[0]
         self.game_board_dims = (self.game_board_height, self.game_board_width)
-        self.number_of_entities = len(game_str_entities)
-
-        # Convert read lines of str entities to a list of entity instances
-        # and load them
-        game_entity_instances = []
-        for entity_info in game_str_entities:
-            if entity_info[0] == TANK_SYMBOL:
-                tankmech_inst = TankMech((int(entity_info[1]), 
-                                          int(entity_info[2])),
-                                         int(entity_info[3]),
-                                         int(entity_info[4]),
-                                         int(entity_info[5]))
-                game_entity_instances.append(tankmech_inst)
-            if entity_info[0] == HEAL_SYMBOL:
-                healmech_inst = HealMech((int(entity_info[1]), 
-                                          int(entity_info[2])),
-                                         int(entity_info[3]),
-                                         int(entity_info[4]),
-                                         int(entity_info[5]))
-                game_entity_instances.append(healmech_inst)
-            if entity_info[0] == SCORPION_SYMBOL:
-                scorpion_inst = Scorpion((int(entity_info[1]), 
-                                          int(entity_info[2])),
-                                         int(entity_info[3]),
-                                         int(entity_info[4]),
-                                         int(entity_info[5]))
-                game_entity_instances.append(scorpion_inst)
-            if entity_info[0] == FIREFLY_SYMBOL:
-                firefly_inst = Firefly((int(entity_info[1]), 
-                                          int(entity_info[2])),
-                                         int(entity_info[3]),
-                                         int(entity_info[4]),
-                                         int(entity_info[5]))
-                game_entity_instances.append(firefly_inst)
-        self.game_entities = game_entity_instances
-        self.breachModel = BreachModel(self.game_board, 
-                                       self.game_entities)
-        # good practice to close file, but this is unnecessary when I am using
-        # with open() as var:
-        game_file.close()
+        self.game_entities = breach_model.get_entities()
+        self.number_of_entities = len(self.game_entities)
 
     def _save_game(self) -> None:
         """
         If the the user has made no moves since the last time they clicked 
         the end turn button, opens a asksaveasfilename file dialog 
         to ask the user to specify a file, and then saves 
-        the current game state to that file.
+        the current game state to that file. 
+        File names ending in SNAPSHOT_EXTENSION are saved as binary snapshots.
 
         If the user has made at least one move since the last time 
         they clicked the end turn button, shows an error message box 
@@ -1900,21 +4179,12 @@ class IntoTheBreach():
         Caution:
             You do not need to handle IOErrors for this operation.
         """   
+        if self._is_busy():
+            return
         if self.breachModel.ready_to_save():
             save_file_name = filedialog.asksaveasfilename()
-            with open(save_file_name, "w") as new_save:
-                # writelines game_board
-                new_save.writelines(str(self.game_board))
-                #writeline a new line \n
-                new_save.write("\n\n")
-
-                #writelines game_entities
-                for entity in self.game_entities:
-                    new_save.write(str(entity) + "\n")
-
-            # good practice to close file, but this is unnecessary 
-            # when I am using with open() as var:   
-            new_save.close()
+            if save_file_name:
+                save_breach_model(self.breachModel, save_file_name)
         else:
             messagebox.showerror(INVALID_SAVE_TITLE, INVALID_SAVE_MESSAGE)
 
@@ -1925,9 +4195,12 @@ class IntoTheBreach():
 
         Caution:
             If an IO error occurs when loading in a new game state, 
+            or the file is malformed,
             then a messagebox should be shown to the user explaining the error 
             as described in load model.
         """
+        if self._is_busy():
+            return
         try:
             load_game_file = filedialog.askopenfilename()
             if load_game_file:
@@ -1935,10 +4208,30 @@ class IntoTheBreach():
                 self.set_focussed_entity(None)
                 self.game_file = load_game_file
 
-            self.redraw()
-        except IOError:
-            messagebox.showerror(IO_ERROR_TITLE, IO_ERROR_MESSAGE)
+            self.schedule_redraw()
+        except (IOError, ValueError) as error:
+            messagebox.showerror(IO_ERROR_TITLE, IO_ERROR_MESSAGE + str(error))
     
+    def _undo(self) -> None:
+        """
+        Undoes the last mech move made this turn, restoring the mech's 
+        position and active state. Does nothing if no move has been made 
+        since the last time the user clicked the end turn button.
+        """
+        if not self._is_busy() and self.breachModel.can_undo(MOVE_ACTION):
+            self.breachModel.undo()
+            self.moving_attacking = False
+            self.set_focussed_entity(None)
+            self.schedule_redraw()
+
+    def _toggle_danger(self) -> None:
+        """
+        Shows or hides the shading of the tiles enemies would attack 
+        in the next attack phase.
+        """
+        self.show_danger = not self.show_danger
+        self.schedule_redraw()
+
     def _end_turn(self) -> None:
         """
         Executes the attack phase, enemy movement phase, 
@@ -1946,30 +4239,151 @@ class IntoTheBreach():
 
         Note: attack phase and enemy movement phase is implemented with the
                 end_turn() under model class (BreachModel).
+                It runs in the background on a copy of the model, and 
+                _finish_end_turn applies the result and does the 
+                termination checking.
         """
+        if self._is_busy():
+            return
+        # the turn is played on a copy on a worker thread, so the window 
+        # keeps responding; input that would change the game is ignored 
+        # until the result is applied
+        turn = self.breachModel.copy()
+
+        def play_turn(report: Callable[[int, int], None]) -> BreachModel:
+            turn.end_turn(report)
+            return turn
+
+        self.breachView.set_controls_enabled(False)
+        self._end_turn_task = BackgroundTask(self.root, 
+                                             play_turn, 
+                                             self._finish_end_turn, 
+                                             self._show_end_turn_progress, 
+                                             self._end_turn_failed)
+        self._end_turn_task.start()
+
+    def _is_busy(self) -> bool:
+        """
+        Returns True iff an end of turn is being played, or a move is being 
+        searched for, in the background.
+        """
+        return self._end_turn_task is not None or self._hint_task is not None
+
+    def _show_end_turn_progress(self, done: int, total: int) -> None:
+        """
+        Shows the progress of the enemy movement phase in the banner.
+        """
+        self.breachView.set_banner_text(END_TURN_PROGRESS_TEXT.format(done, 
+                                                                      total))
+
+    def _end_turn_failed(self, error: Exception) -> None:
+        """
+        Re-enables input after the background end of turn raised an error, 
+        leaving the game state unchanged, and raises the error.
+        """
+        self._end_turn_task = None
+        self.breachView.set_banner_text()
+        self.breachView.set_controls_enabled(True)
+        raise error
+
+    def _suggest_turn(self) -> None:
+        """
+        Searches in the background for the best moves for the mechs that 
+        have not moved yet this turn, for up to SOLVER_TIME_LIMIT seconds, 
+        then highlights the first of them: the mech and its destination.
+        """
+        if self._is_busy():
+            return
+        # the search runs on a fork, and input is ignored until it is done
+        model = self.breachModel
+        version = model.get_version()
+        turn = model.fork()
+
+        def search(report: Callable[[int, int], None]) -> list:
+            return turn.suggest_turn(SOLVER_TIME_LIMIT)
+
+        self.breachView.set_controls_enabled(False)
+        self.breachView.set_banner_text(HINT_SEARCH_TEXT)
+        self._hint_task = BackgroundTask(
+            self.root, 
+            search, 
+            lambda plan: self._show_hint(model, version, plan), 
+            on_error=self._hint_failed)
+        self._hint_task.start()
+
+    def _show_hint(self, 
+                   model: BreachModel, 
+                   version: int, 
+                   plan: list[tuple[int, tuple[int, int]]]) -> None:
+        """
+        Re-enables input and highlights the first move of the plan found by 
+        _suggest_turn, or says in the banner that ending the turn is best.
+
+        Parameters:
+            model: the model the plan was made for.
+            version: the version of the model the plan was made for.
+            plan: the plan from BreachModel.suggest_turn.
+        """
+        self._hint_task = None
+        self.breachView.set_controls_enabled(True)
+        if plan:
+            entity_id, destination = plan[0]
+            mech = model.get_entity_by_id(entity_id)
+            self._hint = (model, version, [mech.get_position(), destination])
+            self.breachView.set_banner_text()
+        else:
+            self._hint = (model, version, [])
+            self.breachView.set_banner_text(HINT_NONE_TEXT)
+        self.schedule_redraw()
+
+    def _hint_failed(self, error: Exception) -> None:
+        """
+        Re-enables input after the background search raised an error, 
+        and raises the error.
+        """
+        self._hint_task = None
+        self.breachView.set_banner_text()
+        self.breachView.set_controls_enabled(True)
+        raise error
+
+    def _finish_end_turn(self, turn: BreachModel) -> None:
+        """
+        Applies the end of turn played in the background, re-enables input, 
+        and checks for the end of the game.
+
+        Parameter:
+            turn: the copy of the model the turn was played on.
+        """
+        self._end_turn_task = None
+        self.breachView.set_banner_text()
+        self.breachView.set_controls_enabled(True)
+
         # end_turn() under Model sets Mech to active
-        self.breachModel.end_turn()
-        if self.coord_highlighted_entity:
+        self.breachModel.apply_end_turn(turn)
+        if self.focussed_entity_id is not None:
             self.set_focussed_entity(None)
-        self.redraw()
+        self.schedule_redraw()
 
         # player won the game
         if self.breachModel.has_won():
+            # show the final board before the dialog blocks
+            self.flush_redraw()
             if messagebox.askyesno('End game', 
                                        "You Win! " + PLAY_AGAIN_TEXT):
                     # yes - play again
                     self.load_model(self.game_file)
-                    self.redraw()
+                    self.schedule_redraw()
             else:
                 #no - end game
                 self.root.destroy()
         #player lost the game
         if self.breachModel.has_lost():
+            self.flush_redraw()
             if messagebox.askyesno('End game', 
                                        "You Lost! " + PLAY_AGAIN_TEXT):
                     # yes - play again
                     self.load_model(self.game_file)
-                    self.redraw()
+                    self.schedule_redraw()
             else:
                 #no - end game
                 self.root.destroy()
@@ -1983,21 +4397,22 @@ class IntoTheBreach():
             position: position (row, col) of user click on the list of board.         
         """
 
-        entity_positions = self.breachModel.entity_positions().keys()
+        if self._is_busy():
+            return
+
+        # look up the clicked entity before any move is made
+        clicked_entity = self.breachModel.get_entity_at(position)
         
         # is there an entity set to be focussed = ready to move?
-        # does not matter if I check the length or if the variable exists
-        # the coord is always storing either 1 or 0 tuple
-        if len(self.coord_highlighted_entity) == 1:
-            focussed_entity = (self.breachModel.entity_positions()
-                             [self.coord_highlighted_entity[0]])
-            if focussed_entity.is_friendly():
+        if self.focussed_entity_id is not None:
+            focussed_entity = (self.breachModel.get_entity_by_id
+                               (self.focussed_entity_id))
+            if focussed_entity is not None and focussed_entity.is_friendly():
                 self.make_move(position)
-                self.redraw()
+                self.schedule_redraw()
 
         # is clicked position containing an entity?
-        if position in entity_positions:
-            clicked_entity = self.breachModel.entity_positions()[position]
+        if clicked_entity is not None:
             # is the selected entity a Mech that the user can move?
             if clicked_entity.is_friendly():
                 # has the Mech moved? Yes means it is deactivated (go to else)
@@ -2006,29 +4421,31 @@ class IntoTheBreach():
                     self.set_focussed_entity(None)
                     self.set_focussed_entity(clicked_entity)
                     self.moving_attacking = False
-                    self.redraw()
+                    self.schedule_redraw()
                 else:
                     # mech has moved - display attack range of the mech
                     self.set_focussed_entity(None)
                     self.set_focussed_entity(clicked_entity)
                     self.moving_attacking = True
-                    self.redraw()
+                    self.schedule_redraw()
             else:
                 # display attack range of selected enemy
                 self.set_focussed_entity(None)
                 self.set_focussed_entity(clicked_entity)
                 self.moving_attacking = True
-                self.redraw()
+                self.schedule_redraw()
 
         # is clicked position not an entity? Yes then clear the highlights
-        if position not in entity_positions:
+        if clicked_entity is None:
             self.set_focussed_entity(None)
-            self.redraw()
+            self.schedule_redraw()
 
 
 # Functions calling classes, since these are not under any classes, 
 # they are not methods
-def play_game(root: tk.Tk, file_path: str) -> None:
+def play_game(root: tk.Tk, 
+              file_path: str, 
+              journal_file: Optional[str] = None) -> None:
     """
     The function only do the following two tasks:
     1. Construct the controller instance using the given file path 
@@ -2039,9 +4456,10 @@ def play_game(root: tk.Tk, file_path: str) -> None:
     Parameter:
         root: root frame of tkinter.
         file_path: game file directory of different levels (level 1 ~ 3).
+        journal_file: optional path to journal the games played to.
     """
     # Pass as "master", and the game file in the class, __init__ method
-    game = IntoTheBreach(root, file_path)
+    game = IntoTheBreach(root, file_path, journal_file)
     root.mainloop()
 
 def main() -> None:
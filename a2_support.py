@@ -1,5 +1,14 @@
+import functools
+import heapq
+import json
+import os
+import queue
+import struct
+import threading
+import time
 import tkinter as tk
-from typing import Union
+import zlib
+from typing import Any, Callable, Optional, Union
 
 # Model Constants
 TANK_RANGE = 5
@@ -44,6 +53,11 @@ GRID_SIZE = 450
 SIDEBAR_WIDTH = 300
 BANNER_HEIGHT = 75
 CONTROL_BAR_HEIGHT = 100
+# Smallest cell drawn by the game grid in pixels, however large the board
+MIN_CELL_SIZE = 12
+# Change in cell size of one zoom step, and cells panned by one scroll step
+ZOOM_STEP = 1.25
+SCROLL_STEP = 3
 
 BANNER_TEXT = "Into The Breach"
 SIDEBAR_HEADINGS = ("Unit", "Coord", "Hp", "Dmg")
@@ -52,12 +66,34 @@ SAVE_TEXT = "Save Game"
 LOAD_TEXT = "Load Game"
 UNDO_TEXT = "Undo Move"
 TURN_TEXT = "End Turn"
+DANGER_TEXT = "Show Danger"
+HINT_TEXT = "Suggest Move"
 
 INVALID_SAVE_TITLE = "Cannot Save!"
 INVALID_SAVE_MESSAGE = "You can only save at the beginning of your turn!"
 IO_ERROR_TITLE = "File Error"
 IO_ERROR_MESSAGE = "Cannot open specified file: "
 PLAY_AGAIN_TEXT = "Would you like to play again?"
+END_TURN_PROGRESS_TEXT = "Enemy turn: {} of {} enemies moved"
+HINT_SEARCH_TEXT = "Searching for the best turn..."
+HINT_NONE_TEXT = "Suggestion: end the turn"
+
+# How often the main thread checks on background work, in milliseconds
+BACKGROUND_POLL_MS = 50
+
+# Seconds the turn solver may search before returning its best plan so far
+SOLVER_TIME_LIMIT = 2.0
+# Turn scores: points for each enemy killed and each building left standing,
+# on top of one point for each point of building and mech health
+SOLVER_KILL_SCORE = 10
+SOLVER_BUILDING_SCORE = 10
+
+# Save files with this extension are written as binary snapshots
+SNAPSHOT_EXTENSION = ".breach"
+# Turns between the full checkpoints written to an action journal
+JOURNAL_CHECKPOINT_TURNS = 10
+# Extension of action journal files
+JOURNAL_EXTENSION = ".itbj"
 
 BANNER_FONT = ("Arial", 22, "bold")
 ENTITY_FONT = ("Arial", 20, "bold")
@@ -69,6 +105,10 @@ GROUND_COLOR = "SandyBrown"
 BUILDING_COLOR = "Turquoise"
 DESTROYED_COLOR = "Teal"
 MOUNTAIN_COLOR = "Olive"
+# Shading of tiles an enemy would hit in the next attack phase
+DANGER_COLOR = "LightSalmon"
+# The mech and destination of the suggested move
+HINT_COLOR = "Gold"
 
 
 class AbstractGrid(tk.Canvas):
@@ -185,9 +225,44 @@ class AbstractGrid(tk.Canvas):
         self.delete("all")
 
 
+def get_blocking_mask(game_state: "BreachModel") -> bytearray:
+    """
+    Builds a flat mask of the board in row-major order, holding 1 for every
+    position that a path may not pass through (blocking tiles and tiles
+    occupied by an entity) and 0 everywhere else.
+
+    The mask stays valid until a tile changes or an entity moves, so it can
+    be built once and shared by many calls to get_distance.
+
+    Args:
+        game_state (BreachModel): Model representing gamestate
+
+    Returns:
+        bytearray: one byte per position, indexed by row * #columns + column.
+    """
+    board = game_state.get_board()
+    rows, cols = board.get_dimensions()
+    if hasattr(board, "get_blocking_array"):
+        # Compact boards already keep a blocking array in the same layout
+        mask = bytearray(board.get_blocking_array())
+    else:
+        mask = bytearray(rows * cols)
+        for row in range(rows):
+            for col in range(cols):
+                if board.get_tile((row, col)).is_blocking():
+                    mask[row * cols + col] = 1
+    for row, col in game_state.entity_positions():
+        if 0 <= row < rows and 0 <= col < cols:
+            mask[row * cols + col] = 1
+    return mask
+
+
 # Note: "" just allows type hint despite BreachModel not being defined in file.
 def get_distance(
-    game_state: "BreachModel", origin: tuple[int, int], destination: tuple[int, int]
+    game_state: "BreachModel",
+    origin: tuple[int, int],
+    destination: tuple[int, int],
+    mask: Optional[bytearray] = None,
 ) -> int:
     """
     Computes the minimum taxicab distance between two points on a given board,
@@ -204,6 +279,9 @@ def get_distance(
                                       a blocking tile according to game_state,
                                       and will not posess an entity according to
                                       game_state
+        mask (bytearray, optional): blocking mask from get_blocking_mask for the
+                                    current game_state. Built on each call if
+                                    not given.
 
     Returns:
         int: taxicab distance of shortest path within the given game board
@@ -212,38 +290,729 @@ def get_distance(
     """
     # Implements A* search algorithm.
     # NOTE: YOU DO NOT NEED TO UNDERSTAND THIS ALGORITHM
-    entity_tiles = set(game_state.entity_positions().keys())
-    # Initialise
-    searched = set()
-    frontier = {origin: 0}
-
-    while len(frontier) > 0:
-        # get minimum frontier node
-        min = float("inf")
-        node = None
-        for key, val in frontier.items():
-            if val < min:
-                node = key
-                min = val
-        # Move node to searched pile
-        value = frontier.pop(node)
-        searched.add(node)
-
-        if node == destination:
-            return value
-        else:
-            # Add children to frontier
-            new_val = value + 1
-            for delta in PLUS_OFFSETS:
-                new_node = (node[0] + delta[0], node[1] + delta[1])
-                if (
-                    (new_node not in searched)
-                    and (new_node not in entity_tiles)
-                    and not (game_state.get_board().get_tile(new_node).is_blocking())
-                    and not (frontier.get(new_node, float("inf")) <= new_val)
-                ):
-                    frontier[new_node] = new_val
-                    
+    if origin == destination:
+        return 0
+    rows, cols = game_state.get_board().get_dimensions()
+    if mask is None:
+        mask = get_blocking_mask(game_state)
+    dest_row, dest_col = destination
+    goal = dest_row * cols + dest_col
+
+    # Positions are stored as flat indices. The taxicab distance to the
+    # destination never overestimates, so the first time the destination is
+    # popped its cost is the shortest path length.
+    start = origin[0] * cols + origin[1]
+    best = {start: 0}
+    frontier = [(abs(origin[0] - dest_row) + abs(origin[1] - dest_col), 0, start)]
+
+    while frontier:
+        _, cost, node = heapq.heappop(frontier)
+        # Prefer deeper nodes on ties by storing the cost negated
+        cost = -cost
+        if node == goal:
+            if INSTRUMENTATION.enabled:
+                INSTRUMENTATION.count_search("get_distance", len(best))
+            return cost
+        if cost > best[node]:
+            continue
+        row, col = divmod(node, cols)
+        new_cost = cost + 1
+        for delta_row, delta_col in PLUS_OFFSETS:
+            new_row, new_col = row + delta_row, col + delta_col
+            if not (0 <= new_row < rows and 0 <= new_col < cols):
+                continue
+            new_node = new_row * cols + new_col
+            if mask[new_node] or best.get(new_node, new_cost + 1) <= new_cost:
+                continue
+            best[new_node] = new_cost
+            estimate = new_cost + abs(new_row - dest_row) + abs(new_col - dest_col)
+            heapq.heappush(frontier, (estimate, -new_cost, new_node))
 
     # We have run out of paths
+    if INSTRUMENTATION.enabled:
+        INSTRUMENTATION.count_search("get_distance", len(best))
     return -1
+
+
+# Zobrist hashing. Every feature of a game state, such as a mountain, the
+# health of a building or an entity with all its attributes, has a
+# pseudo-random 64-bit key, and the hash of a state is the XOR of the keys of
+# its features. Changing one feature then changes the hash in constant time.
+ZOBRIST_SEED = 0x3C6EF372FE94F82B
+_MASK64 = (1 << 64) - 1
+
+
+def splitmix64(value: int) -> int:
+    """
+    Returns the next output of the SplitMix64 generator from the given
+    state, a well mixed 64-bit integer.
+
+    Args:
+        value (int): generator state; only the low 64 bits are used.
+
+    Returns:
+        int: a 64-bit integer.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def zobrist_key(*parts: int) -> int:
+    """
+    Returns the 64-bit Zobrist key of a feature described by integers.
+    The same parts always give the same key, in every process.
+
+    Args:
+        *parts (int): the integers describing the feature.
+
+    Returns:
+        int: the key.
+    """
+    key = ZOBRIST_SEED
+    for part in parts:
+        key = splitmix64(key ^ (part & _MASK64))
+    return key
+
+
+# Binary snapshot format. A snapshot starts with SNAPSHOT_MAGIC, a version
+# byte and a flags byte. The rest is the payload, zlib compressed if the
+# SNAPSHOT_COMPRESSED flag is set. The payload is a header giving the board
+# dimensions, model flags and entity count, then the tile array, then the
+# health array (one byte per position, row-major), then one fixed-width
+# record per entity in priority order.
+SNAPSHOT_MAGIC = b"ITBS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_COMPRESSED = 1
+# Fastest zlib level: boards are mostly runs of ground and mountains
+SNAPSHOT_COMPRESSION_LEVEL = 1
+_SNAPSHOT_PREAMBLE = struct.Struct("<4sBB")
+_SNAPSHOT_HEADER = struct.Struct("<IIBI")
+# symbol, row, col, health, speed, strength, active
+_SNAPSHOT_ENTITY = struct.Struct("<cIIiiiB")
+
+
+def is_snapshot(data: bytes) -> bool:
+    """
+    Returns True iff the given bytes (at least the start of a file) begin
+    like a binary snapshot.
+    """
+    return data[:len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC
+
+
+def pack_snapshot(
+    dimensions: tuple[int, int],
+    tiles: bytes,
+    health: bytes,
+    entities: list[tuple[str, int, int, int, int, int, bool]],
+    model_flags: int = 0,
+    compress: bool = True,
+) -> bytes:
+    """
+    Encodes a game state as a binary snapshot.
+
+    Args:
+        dimensions (tuple[int,int]): (#rows, #columns) of the board.
+        tiles (bytes): tile kind of every position, row-major.
+        health (bytes): building health of every position, row-major.
+        entities (list): one (symbol, row, col, health, speed, strength,
+                         active) tuple per entity, in priority order.
+        model_flags (int): flags of the model, from 0 to 255.
+        compress (bool): whether to zlib compress the payload.
+
+    Returns:
+        bytes: the snapshot.
+    """
+    rows, cols = dimensions
+    payload = bytearray(
+        _SNAPSHOT_HEADER.pack(rows, cols, model_flags, len(entities)))
+    payload += tiles
+    payload += health
+    for symbol, row, col, hp, speed, strength, active in entities:
+        payload += _SNAPSHOT_ENTITY.pack(
+            symbol.encode("ascii"), row, col, hp, speed, strength, int(active)
+        )
+    flags = SNAPSHOT_COMPRESSED if compress else 0
+    if compress:
+        payload = zlib.compress(payload, SNAPSHOT_COMPRESSION_LEVEL)
+    return _SNAPSHOT_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags) + payload
+
+
+def unpack_snapshot(data: bytes) -> tuple:
+    """
+    Decodes a binary snapshot made by pack_snapshot.
+
+    Args:
+        data (bytes): the snapshot.
+
+    Returns:
+        tuple: (dimensions, tiles, health, entities, model_flags) in the
+               form taken by pack_snapshot.
+
+    Raises:
+        ValueError: if the data is not a valid snapshot of a known version.
+    """
+    if len(data) < _SNAPSHOT_PREAMBLE.size or not is_snapshot(data):
+        raise ValueError("not a snapshot")
+    _, version, flags = _SNAPSHOT_PREAMBLE.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    payload = data[_SNAPSHOT_PREAMBLE.size:]
+    if flags & SNAPSHOT_COMPRESSED:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as error:
+            raise ValueError(f"corrupt snapshot: {error}") from None
+
+    if len(payload) < _SNAPSHOT_HEADER.size:
+        raise ValueError("truncated snapshot")
+    rows, cols, model_flags, count = _SNAPSHOT_HEADER.unpack_from(payload)
+    size = rows * cols
+    offset = _SNAPSHOT_HEADER.size
+    expected = offset + 2 * size + count * _SNAPSHOT_ENTITY.size
+    if len(payload) != expected:
+        raise ValueError(
+            f"snapshot holds {len(payload)} bytes but {expected} were expected"
+        )
+    tiles = payload[offset:offset + size]
+    health = payload[offset + size:offset + 2 * size]
+    offset += 2 * size
+
+    entities = []
+    for _ in range(count):
+        symbol, row, col, hp, speed, strength, active = (
+            _SNAPSHOT_ENTITY.unpack_from(payload, offset))
+        entities.append(
+            (symbol.decode("ascii"), row, col, hp, speed, strength, bool(active))
+        )
+        offset += _SNAPSHOT_ENTITY.size
+    return (rows, cols), tiles, health, entities, model_flags
+
+
+# Action journal format. A journal starts with JOURNAL_MAGIC and a version
+# byte, then holds records appended as the game is played. Every record is a
+# kind byte and a payload length, then the payload:
+#   JOURNAL_CHECKPOINT: the turn, the next entity handle and the entity
+#       count, the handle of every entity in priority order, then a snapshot.
+#   JOURNAL_MOVE: the handle, row and column of an entity that was moved.
+#   JOURNAL_END_TURN: the turn starting, the number of entities that moved
+#       during the end of turn, then the handle, row and column of each.
+#   JOURNAL_UNDO: 1 if an end of turn was undone, 0 if a move was.
+# A record cut short, say by a crash while it was written, ends the journal.
+JOURNAL_MAGIC = b"ITBJ"
+JOURNAL_VERSION = 1
+JOURNAL_CHECKPOINT = b"C"
+JOURNAL_MOVE = b"M"
+JOURNAL_END_TURN = b"E"
+JOURNAL_UNDO = b"U"
+_JOURNAL_PREAMBLE = struct.Struct("<4sB")
+_JOURNAL_RECORD = struct.Struct("<cI")
+_JOURNAL_COUNTS = struct.Struct("<III")
+_JOURNAL_TURN = struct.Struct("<II")
+# entity handle, row, col
+_JOURNAL_POSITION = struct.Struct("<III")
+
+
+def is_journal(data: bytes) -> bool:
+    """
+    Returns True iff the given bytes (at least the start of a file) begin
+    like an action journal.
+    """
+    return data[:len(JOURNAL_MAGIC)] == JOURNAL_MAGIC
+
+
+def read_journal(data: bytes) -> list[tuple[bytes, tuple]]:
+    """
+    Decodes the records of an action journal written by ActionJournal.
+
+    Args:
+        data (bytes): the journal.
+
+    Returns:
+        list: one (kind, values) pair per record, in the order written, where
+              values are:
+                  JOURNAL_CHECKPOINT: (turn, next entity handle,
+                                       entity handles, snapshot)
+                  JOURNAL_MOVE: (entity handle, (row, col))
+                  JOURNAL_END_TURN: (turn, [(entity handle, (row, col)), ...])
+                  JOURNAL_UNDO: (whether an end of turn was undone,)
+
+    Raises:
+        ValueError: if the data is not a journal of a known version, or
+                    holds an unknown or malformed record.
+    """
+    if len(data) < _JOURNAL_PREAMBLE.size or not is_journal(data):
+        raise ValueError("not a journal")
+    _, version = _JOURNAL_PREAMBLE.unpack_from(data)
+    if version != JOURNAL_VERSION:
+        raise ValueError(f"unsupported journal version {version}")
+
+    records = []
+    offset = _JOURNAL_PREAMBLE.size
+    while offset + _JOURNAL_RECORD.size <= len(data):
+        kind, length = _JOURNAL_RECORD.unpack_from(data, offset)
+        offset += _JOURNAL_RECORD.size
+        if offset + length > len(data):
+            # the last record was cut short
+            break
+        payload = data[offset:offset + length]
+        offset += length
+        try:
+            records.append((kind, _unpack_journal_record(kind, payload)))
+        except struct.error:
+            raise ValueError(f"malformed journal record {len(records)}") \
+                from None
+    return records
+
+
+def _unpack_journal_record(kind: bytes, payload: bytes) -> tuple:
+    """
+    Decodes the payload of one journal record, as described in read_journal.
+    """
+    if kind == JOURNAL_CHECKPOINT:
+        turn, next_handle, count = _JOURNAL_COUNTS.unpack_from(payload)
+        end = _JOURNAL_COUNTS.size + 4 * count
+        handles = list(struct.unpack_from(f"<{count}I", payload,
+                                          _JOURNAL_COUNTS.size))
+        return turn, next_handle, handles, payload[end:]
+    if kind == JOURNAL_MOVE:
+        handle, row, col = _JOURNAL_POSITION.unpack(payload)
+        return handle, (row, col)
+    if kind == JOURNAL_END_TURN:
+        turn, count = _JOURNAL_TURN.unpack_from(payload)
+        if len(payload) != _JOURNAL_TURN.size + count * _JOURNAL_POSITION.size:
+            raise struct.error("wrong end of turn length")
+        moves = [(handle, (row, col))
+                 for handle, row, col in _JOURNAL_POSITION.iter_unpack(
+                     payload[_JOURNAL_TURN.size:])]
+        return turn, moves
+    if kind == JOURNAL_UNDO:
+        return (bool(struct.unpack("<B", payload)[0]),)
+    raise ValueError(f"unknown journal record kind {kind!r}")
+
+
+class ActionJournal:
+    """Appends the actions of one game to a journal file as they happen.
+    Every record is flushed as soon as it is written, so the journal survives
+    the game crashing. Counts the turns, and keeps track of which undos can
+    be replayed from the last checkpoint."""
+
+    def __init__(
+        self,
+        file_path: str,
+        checkpoint_interval: int = JOURNAL_CHECKPOINT_TURNS,
+    ) -> None:
+        """Constructor for ActionJournal. Creates the file, replacing any
+        file already there. The first record written should be a checkpoint.
+
+        Parameters:
+            file_path: Path of the journal file.
+            checkpoint_interval: Turns between checkpoints.
+        """
+        self._file = open(file_path, "wb")
+        self._file.write(_JOURNAL_PREAMBLE.pack(JOURNAL_MAGIC, JOURNAL_VERSION))
+        self._checkpoint_interval = checkpoint_interval
+        self._turn = 0
+        self._turns_since_checkpoint = 0
+        # recorded actions since the last checkpoint that can still be undone
+        self._undoable = 0
+
+    def get_turn(self) -> int:
+        """Returns the number of the turn in progress, counting from 0."""
+        return self._turn
+
+    def checkpoint_due(self) -> bool:
+        """Returns True iff checkpoint_interval turns have ended since the
+        last checkpoint."""
+        return self._turns_since_checkpoint >= self._checkpoint_interval
+
+    def record_checkpoint(
+        self, next_handle: int, handles: list[int], snapshot: bytes
+    ) -> None:
+        """Records the full game state.
+
+        Parameters:
+            next_handle: The handle the next new entity would get.
+            handles: The handle of every entity, in priority order.
+            snapshot: The game state, from BreachModel.to_snapshot.
+        """
+        self._write(
+            JOURNAL_CHECKPOINT,
+            _JOURNAL_COUNTS.pack(self._turn, next_handle, len(handles))
+            + struct.pack(f"<{len(handles)}I", *handles)
+            + snapshot,
+        )
+        self._turns_since_checkpoint = 0
+        self._undoable = 0
+
+    def record_move(self, handle: int, position: tuple[int, int]) -> None:
+        """Records an entity being moved by attempt_move.
+
+        Parameters:
+            handle: The handle of the entity.
+            position: Where it moved to.
+        """
+        self._write(JOURNAL_MOVE, _JOURNAL_POSITION.pack(handle, *position))
+        self._undoable += 1
+
+    def record_end_turn(
+        self, moves: list[tuple[int, tuple[int, int]]], undoable: bool
+    ) -> None:
+        """Records an end of turn, and the entities it moved.
+
+        Parameters:
+            moves: The (handle, position moved to) of every entity that moved.
+            undoable: Whether the end of turn changed anything, and so can be
+                      undone.
+        """
+        self._turn += 1
+        self._turns_since_checkpoint += 1
+        self._write(
+            JOURNAL_END_TURN,
+            _JOURNAL_TURN.pack(self._turn, len(moves))
+            + b"".join(_JOURNAL_POSITION.pack(handle, *position)
+                       for handle, position in moves),
+        )
+        self._undoable += undoable
+
+    def record_undo(self, end_turn: bool) -> bool:
+        """Records the last action being undone. If that action came before
+        the last checkpoint, the undo cannot be replayed from it, so a
+        checkpoint should be recorded straight after.
+
+        Parameters:
+            end_turn: Whether an end of turn was undone, rather than a move.
+
+        Returns:
+            bool: True iff the undo can be replayed from the last checkpoint.
+        """
+        if end_turn:
+            self._turn -= 1
+        self._write(JOURNAL_UNDO, bytes([end_turn]))
+        if not self._undoable:
+            return False
+        self._undoable -= 1
+        return True
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        self._file.close()
+
+    def _write(self, kind: bytes, payload: bytes) -> None:
+        """Appends one record and flushes it to the file."""
+        self._file.write(_JOURNAL_RECORD.pack(kind, len(payload)) + payload)
+        self._file.flush()
+
+
+class BackgroundTask:
+    """Runs a function on a worker thread while the tkinter event loop keeps
+    running. Progress reports and the result are handed back to the main
+    thread, which polls for them with root.after, so the callbacks may
+    safely update widgets."""
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        work: Callable[[Callable[[int, int], None]], Any],
+        on_done: Callable[[Any], None],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        """Constructor for BackgroundTask. The task starts when start is
+        called.
+
+        Parameters:
+            root: Any widget, used to schedule polls on the main thread.
+            work: Called on the worker thread with a report(done, total)
+                  function, and returns the result.
+            on_done: Called on the main thread with the result.
+            on_progress: Called on the main thread with the latest
+                         (done, total) reported, if any.
+            on_error: Called on the main thread with the exception if work
+                      raises one. If None, the exception is raised there.
+        """
+        self._root = root
+        self._work = work
+        self._on_done = on_done
+        self._on_progress = on_progress
+        self._on_error = on_error
+        self._messages = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._running = False
+
+    def start(self) -> None:
+        """Starts the work on the worker thread and begins polling."""
+        self._running = True
+        self._thread.start()
+        self._root.after(BACKGROUND_POLL_MS, self._poll)
+
+    def is_running(self) -> bool:
+        """Returns True iff the task has started and its result has not yet
+        been handed to on_done or on_error."""
+        return self._running
+
+    def _run(self) -> None:
+        """Runs the work and queues its outcome. Called on the worker
+        thread."""
+        try:
+            result = self._work(self._report)
+        except Exception as error:
+            self._messages.put(("error", error))
+        else:
+            self._messages.put(("done", result))
+
+    def _report(self, done: int, total: int) -> None:
+        """Queues a progress report. Called on the worker thread."""
+        self._messages.put(("progress", (done, total)))
+
+    def _poll(self) -> None:
+        """Handles the queued messages, then polls again unless the work has
+        finished. Called on the main thread."""
+        progress = None
+        while True:
+            try:
+                kind, value = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # only the latest report is worth showing
+                progress = value
+                continue
+            self._running = False
+            if kind == "error" and self._on_error is None:
+                raise value
+            if kind == "error":
+                self._on_error(value)
+            else:
+                self._on_done(value)
+            return
+        if progress is not None and self._on_progress is not None:
+            self._on_progress(*progress)
+        self._root.after(BACKGROUND_POLL_MS, self._poll)
+
+
+class Deadline:
+    """A point in time after which work should stop, measured with
+    time.monotonic so that changes to the system clock do not move it."""
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        """Constructor for Deadline.
+
+        Parameters:
+            seconds: Time from now until the deadline, or None for a deadline
+                     that never passes.
+        """
+        self._end = None if seconds is None else time.monotonic() + seconds
+
+    def expired(self) -> bool:
+        """Returns True iff the deadline has passed."""
+        return self._end is not None and time.monotonic() >= self._end
+
+    def remaining(self) -> float:
+        """Returns the seconds left until the deadline, which is 0 once it has
+        passed and infinite if it never passes."""
+        if self._end is None:
+            return float("inf")
+        return max(0.0, self._end - time.monotonic())
+
+
+class _Span:
+    """Times one run of a named piece of work for an Instrumentation, as a
+    context manager."""
+
+    def __init__(self, instrumentation: "Instrumentation", name: str) -> None:
+        self._instrumentation = instrumentation
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._instrumentation.add_time(self._name, self._start,
+                                       time.perf_counter())
+
+
+class _NullSpan:
+    """The span handed out while instrumentation is disabled, which does
+    nothing."""
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """Opt-in counters and timers for finding where time goes.
+
+    While disabled, which is the default, span hands out a shared no-op
+    context manager and every other call site checks the enabled attribute
+    before doing any work. While enabled, counts and timings are collected
+    and every timed span is kept as a trace event, which can be exported in
+    the Chrome trace-event format and opened in chrome://tracing or Perfetto.
+    Spans may be timed from any thread."""
+
+    def __init__(self) -> None:
+        """Constructor for Instrumentation. Starts disabled and empty."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._counters = {}
+        self._timers = {}
+        self._events = []
+
+    def enable(self) -> None:
+        """Starts collecting counts, timings and trace events."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops collecting. Whatever was collected is kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Forgets everything collected, and restarts the trace clock."""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._counters = {}
+            self._timers = {}
+            self._events = []
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Adds amount to the named counter.
+
+        Parameters:
+            name: Name of the counter, such as "get_distance.calls".
+            amount: Amount to add.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def count_search(self, name: str, nodes: int) -> None:
+        """Counts one call of the named path search, and the positions it
+        reached, as the counters "<name>.calls" and "<name>.nodes".
+
+        Parameters:
+            name: Name of the search.
+            nodes: Number of positions the search reached.
+        """
+        with self._lock:
+            calls, reached = name + ".calls", name + ".nodes"
+            self._counters[calls] = self._counters.get(calls, 0) + 1
+            self._counters[reached] = self._counters.get(reached, 0) + nodes
+
+    def span(self, name: str) -> Union[_Span, _NullSpan]:
+        """Returns a context manager that times the work done inside it under
+        the given name, or does nothing while disabled.
+
+        Parameters:
+            name: Name of the timer, such as "end_turn.attack".
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """Returns a decorator that times every call of the function it
+        decorates under the given name while enabled. While disabled, the
+        function is called straight away.
+
+        Parameters:
+            name: Name of the timer.
+        """
+
+        def decorate(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def timed_function(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.add_time(name, start, time.perf_counter())
+
+            return timed_function
+
+        return decorate
+
+    def add_time(self, name: str, start: float, end: float) -> None:
+        """Records one run of the named timer, between two time.perf_counter
+        readings.
+
+        Parameters:
+            name: Name of the timer.
+            start: Reading when the work started.
+            end: Reading when the work ended.
+        """
+        with self._lock:
+            calls, total = self._timers.get(name, (0, 0.0))
+            self._timers[name] = (calls + 1, total + end - start)
+            self._events.append((name, start, end, threading.get_ident()))
+
+    def get_counters(self) -> dict[str, int]:
+        """Returns a copy of every counter, by name."""
+        with self._lock:
+            return dict(self._counters)
+
+    def get_timers(self) -> dict[str, tuple[int, float]]:
+        """Returns the (number of runs, total seconds) of every timer, by
+        name."""
+        with self._lock:
+            return dict(self._timers)
+
+    def to_chrome_trace(self) -> dict:
+        """Returns everything collected in the Chrome trace-event format: a
+        complete ("X") event for every timed span, and a counter ("C") event
+        with the final value of every counter.
+
+        Returns:
+            dict: JSON-serialisable trace, with times in microseconds since
+                  the instrumentation was created or last reset.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {
+                    "name": name,
+                    "cat": name.split(".")[0],
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": thread,
+                }
+                for name, start, end, thread in self._events
+            ]
+            end_time = max([event["ts"] + event["dur"] for event in events],
+                           default=0)
+            events.extend(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": end_time,
+                    "pid": pid,
+                    "args": {"value": value},
+                }
+                for name, value in self._counters.items()
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, file_path: str) -> None:
+        """Writes to_chrome_trace to a JSON file.
+
+        Parameters:
+            file_path: Path of the file to write.
+        """
+        with open(file_path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+
+# Instrumentation shared by the game, disabled until enable is called
+INSTRUMENTATION = Instrumentation()
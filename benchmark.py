@@ -0,0 +1,358 @@
+"""
+Benchmarks for the BreachModel hot paths.
+
+Times get_distance, get_valid_movement_positions, move_enemies, make_attack
+and end_turn on the shipped levels and on synthetic boards of configurable
+size, mountain density and entity count. Results report the median and
+95th percentile of each benchmark, can be saved as JSON, and can be checked
+against a saved baseline to catch slowdowns.
+
+Example:
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json
+    python benchmark.py --only end_turn --trace end_turn_trace.json
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Optional
+
+from a2 import (BreachModel, Board, TankMech, HealMech, Scorpion, Firefly,
+                load_breach_model)
+from a2_support import INSTRUMENTATION, get_distance
+
+LEVEL_PATTERN = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "levels", "level*.txt")
+
+DEFAULT_SIZES = (20, 50, 100)
+DEFAULT_DENSITY = 0.2
+DEFAULT_ENTITIES = 12
+DEFAULT_REPEAT = 15
+DEFAULT_THRESHOLD = 0.25
+# slowdowns smaller than this are treated as timer noise
+NOISE_FLOOR = 0.0002
+
+# A benchmark prepares untimed state from a fresh model and returns the
+# call to be timed
+Benchmark = Callable[[BreachModel, random.Random], Callable[[], None]]
+
+
+def make_synthetic_model(rows: int,
+                         cols: int,
+                         mountain_density: float,
+                         entity_count: int,
+                         seed: int = 0) -> BreachModel:
+    """
+    Builds a random model surrounded by mountains, with mountains scattered
+    over the inside, a few buildings, and an even mix of mechs and enemies.
+
+    Parameters:
+        rows: number of board rows.
+        cols: number of board columns.
+        mountain_density: chance of each inner tile being a mountain.
+        entity_count: number of entities to place.
+        seed: seed for the board layout.
+    """
+    rng = random.Random(seed)
+    board = []
+    for row in range(rows):
+        board_row = []
+        for col in range(cols):
+            if row in (0, rows - 1) or col in (0, cols - 1):
+                board_row.append("M")
+            elif rng.random() < mountain_density:
+                board_row.append("M")
+            elif rng.random() < 0.03:
+                board_row.append(str(rng.randint(1, 9)))
+            else:
+                board_row.append(" ")
+        board.append(board_row)
+
+    free = [(row, col) for row in range(rows) for col in range(cols)
+            if board[row][col] == " "]
+    rng.shuffle(free)
+    entity_classes = (TankMech, HealMech, Scorpion, Firefly)
+    entities = [entity_classes[index % len(entity_classes)](
+                    position, rng.randint(2, 6), rng.randint(2, 5),
+                    rng.randint(1, 3))
+                for index, position in enumerate(free[:entity_count])]
+    # mechs come first in priority order, as in the shipped levels
+    entities.sort(key=lambda entity: not entity.is_friendly())
+    return BreachModel(Board(board), entities)
+
+
+def _free_position(model: BreachModel,
+                   rng: random.Random) -> tuple[int, int]:
+    """Returns a random position that is neither blocking nor occupied."""
+    board = model.get_board()
+    rows, cols = board.get_dimensions()
+    while True:
+        position = (rng.randrange(rows), rng.randrange(cols))
+        if (not board.get_tile(position).is_blocking()
+            and model.get_entity_at(position) is None):
+            return position
+
+
+def bench_get_distance(model: BreachModel,
+                       rng: random.Random) -> Callable[[], None]:
+    """Shortest path between two random free positions."""
+    origin, destination = _free_position(model, rng), _free_position(model, rng)
+    return lambda: get_distance(model, origin, destination)
+
+
+def bench_valid_movement(model: BreachModel,
+                         rng: random.Random) -> Callable[[], None]:
+    """Valid movement positions of every entity."""
+    entities = list(model.get_entities())
+
+    def run() -> None:
+        for entity in entities:
+            model.get_valid_movement_positions(entity)
+    return run
+
+
+def bench_move_enemies(model: BreachModel,
+                       rng: random.Random) -> Callable[[], None]:
+    """One enemy movement phase, after objectives are assigned."""
+    model.assign_objectives()
+    return model.move_enemies
+
+
+def bench_make_attack(model: BreachModel,
+                      rng: random.Random) -> Callable[[], None]:
+    """One attack from every entity."""
+    entities = list(model.get_entities())
+
+    def run() -> None:
+        for entity in entities:
+            model.make_attack(entity)
+    return run
+
+
+def bench_end_turn(model: BreachModel,
+                   rng: random.Random) -> Callable[[], None]:
+    """A full end of turn: attacks, objectives and enemy movement."""
+    return model.end_turn
+
+
+BENCHMARKS = {
+    "get_distance": bench_get_distance,
+    "get_valid_movement_positions": bench_valid_movement,
+    "move_enemies": bench_move_enemies,
+    "make_attack": bench_make_attack,
+    "end_turn": bench_end_turn,
+}
+
+
+def summarise(times: list[float]) -> dict:
+    """
+    Returns the median, 95th percentile, minimum and maximum of a list of
+    timings in seconds.
+    """
+    ordered = sorted(times)
+    p95_index = max(0, math.ceil(0.95 * len(ordered)) - 1)
+    return {
+        "median": statistics.median(ordered),
+        "p95": ordered[p95_index],
+        "min": ordered[0],
+        "max": ordered[-1],
+        "repeat": len(ordered),
+    }
+
+
+def measure(make_model: Callable[[], BreachModel],
+            benchmark: Benchmark,
+            repeat: int,
+            seed: int = 0) -> dict:
+    """
+    Times a benchmark on a fresh model for each repetition.
+    Building the model and the benchmark's setup are not timed.
+
+    Parameters:
+        make_model: returns a fresh model to benchmark.
+        benchmark: prepares the call to time.
+        repeat: number of timed repetitions.
+        seed: seed for the benchmark's random choices.
+    """
+    rng = random.Random(seed)
+    times = []
+    for _ in range(repeat):
+        call = benchmark(make_model(), rng)
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return summarise(times)
+
+
+def get_cases(sizes: tuple[int, ...],
+              density: float,
+              entity_count: int) -> dict[str, Callable[[], BreachModel]]:
+    """
+    Returns the models to benchmark, by name: every shipped level,
+    then a synthetic square board for each size.
+    """
+    cases = {}
+    for level_file in sorted(glob.glob(LEVEL_PATTERN)):
+        name = os.path.splitext(os.path.basename(level_file))[0]
+        cases[name] = lambda level_file=level_file: load_breach_model(
+            level_file)
+    for size in sizes:
+        name = f"synthetic_{size}x{size}_d{density}_e{entity_count}"
+        cases[name] = lambda size=size: make_synthetic_model(
+            size, size, density, entity_count)
+    return cases
+
+
+def run_benchmarks(sizes: tuple[int, ...] = DEFAULT_SIZES,
+                   density: float = DEFAULT_DENSITY,
+                   entity_count: int = DEFAULT_ENTITIES,
+                   repeat: int = DEFAULT_REPEAT,
+                   only: Optional[list[str]] = None) -> dict:
+    """
+    Runs every benchmark on every case.
+
+    Parameters:
+        sizes: side lengths of the synthetic boards.
+        density: mountain density of the synthetic boards.
+        entity_count: number of entities on the synthetic boards.
+        repeat: number of timed repetitions of each benchmark.
+        only: names of the benchmarks to run, or None for all of them.
+
+    Returns:
+        A dictionary with run metadata and, under "results", the timing
+        summary of each "case/benchmark".
+    """
+    results = {}
+    for case_name, make_model in get_cases(sizes, density,
+                                           entity_count).items():
+        for bench_name, benchmark in BENCHMARKS.items():
+            if only and bench_name not in only:
+                continue
+            results[f"{case_name}/{bench_name}"] = measure(make_model,
+                                                           benchmark, repeat)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns a message for every benchmark whose median is slower than the
+    baseline's median by more than threshold (0.25 means 25%), ignoring
+    slowdowns below NOISE_FLOOR seconds. Benchmarks missing from either run
+    are skipped.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median"]
+        after = result["median"]
+        if (after > before * (1 + threshold)
+            and after - before > NOISE_FLOOR):
+            change = f" ({after / before - 1:+.0%})" if before else ""
+            regressions.append(f"{name}: median {after * 1e3:.3f}ms vs "
+                               f"baseline {before * 1e3:.3f}ms{change}")
+    return regressions
+
+
+def format_results(report: dict) -> str:
+    """Returns a table of the medians and 95th percentiles in a report."""
+    width = max([len(name) for name in report["results"]] + [9])
+    lines = [f"{'benchmark':<{width}}  {'median ms':>10}  {'p95 ms':>10}"]
+    for name, result in report["results"].items():
+        lines.append(f"{name:<{width}}  {result['median'] * 1e3:>10.3f}  "
+                     f"{result['p95'] * 1e3:>10.3f}")
+    return "\n".join(lines)
+
+
+def format_instrumentation() -> str:
+    """
+    Returns a table of the instrumentation's timers, then its counters.
+    """
+    timers = INSTRUMENTATION.get_timers()
+    counters = INSTRUMENTATION.get_counters()
+    width = max([len(name) for name in [*timers, *counters]] + [7])
+    lines = [f"{'timer':<{width}}  {'calls':>10}  {'total ms':>10}"]
+    for name, (calls, total) in sorted(timers.items()):
+        lines.append(f"{name:<{width}}  {calls:>10}  {total * 1e3:>10.3f}")
+    lines.append(f"\n{'counter':<{width}}  {'value':>10}")
+    for name, value in sorted(counters.items()):
+        lines.append(f"{name:<{width}}  {value:>10}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line entry point. Returns 1 if a benchmark regressed against
+    the baseline, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the BreachModel hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated synthetic board sizes "
+                             "(default: %(default)s)")
+    parser.add_argument("--density", type=float, default=DEFAULT_DENSITY,
+                        help="synthetic mountain density "
+                             "(default: %(default)s)")
+    parser.add_argument("--entities", type=int, default=DEFAULT_ENTITIES,
+                        help="synthetic entity count (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timed repetitions (default: %(default)s)")
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS),
+                        help="run only this benchmark (may be repeated)")
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="write the results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="compare the results against this baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown of the median before it "
+                             "counts as a regression (default: %(default)s)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="instrument the run and write a Chrome "
+                             "trace-event file here; timings include the "
+                             "instrumentation's own overhead")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(size) for size in args.sizes.split(",") if size)
+    if args.trace:
+        INSTRUMENTATION.reset()
+        INSTRUMENTATION.enable()
+    report = run_benchmarks(sizes, args.density, args.entities, args.repeat,
+                            args.only)
+    print(format_results(report))
+
+    if args.trace:
+        INSTRUMENTATION.disable()
+        INSTRUMENTATION.export_chrome_trace(args.trace)
+        print(f"\n{format_instrumentation()}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as output_file:
+                json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file),
+                                  args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Seeded procedural level generator.
+
+Writes game files in the format read by load_breach_model: the board as rows
+of tile symbols, a blank line, then one entity per line as
+"symbol,row,col,health,speed,strength" in descending priority order
+(mechs first). The same seed and settings always give the same file.
+
+Example:
+    python generate_level.py big.txt --rows 1000 --cols 1000 --seed 7
+"""
+import argparse
+import random
+from typing import Iterator, Optional
+
+from a2_support import (GROUND_SYMBOL, MOUNTAIN_SYMBOL, MAX_BUILDING_HEALTH,
+                        TANK_SYMBOL, HEAL_SYMBOL, SCORPION_SYMBOL,
+                        FIREFLY_SYMBOL)
+
+DEFAULT_MOUNTAIN_DENSITY = 0.15
+
+# (health, speed, strength) ranges for each kind of unit, in priority order
+UNIT_STATS = {
+    TANK_SYMBOL: ((3, 5), (2, 4), (2, 3)),
+    HEAL_SYMBOL: ((2, 5), (2, 4), (1, 3)),
+    SCORPION_SYMBOL: ((2, 4), (2, 4), (1, 2)),
+    FIREFLY_SYMBOL: ((1, 3), (1, 3), (1, 2)),
+}
+
+
+def generate_level(rows: int,
+                   cols: int,
+                   seed: int = 0,
+                   mountain_density: float = DEFAULT_MOUNTAIN_DENSITY,
+                   buildings: int = 4,
+                   tanks: int = 2,
+                   heals: int = 1,
+                   scorpions: int = 2,
+                   fireflies: int = 2) -> Iterator[str]:
+    """
+    Yields the lines of a random level, without line endings.
+
+    The board is surrounded by mountains and has mountains scattered over
+    its inside. Buildings and units are then placed on distinct free tiles.
+
+    Parameters:
+        rows: number of board rows, at least 3.
+        cols: number of board columns, at least 3.
+        seed: seed that fully determines the level.
+        mountain_density: chance of each inner tile being a mountain.
+        buildings: number of buildings, each with random health from 1 to 9.
+        tanks: number of tank mechs.
+        heals: number of heal mechs.
+        scorpions: number of scorpions.
+        fireflies: number of fireflies.
+
+    Raises:
+        ValueError: if the board is too small, or there are not enough free
+                    tiles for every building and unit.
+    """
+    if rows < 3 or cols < 3:
+        raise ValueError("a level needs at least 3 rows and 3 columns")
+    rng = random.Random(seed)
+    mountain = ord(MOUNTAIN_SYMBOL)
+    ground = ord(GROUND_SYMBOL)
+
+    board = []
+    free_tiles = 0
+    for row in range(rows):
+        if row in (0, rows - 1):
+            board.append(bytearray([mountain]) * cols)
+            continue
+        board_row = bytearray([mountain])
+        for _ in range(cols - 2):
+            if rng.random() < mountain_density:
+                board_row.append(mountain)
+            else:
+                board_row.append(ground)
+                free_tiles += 1
+        board_row.append(mountain)
+        board.append(board_row)
+
+    units = ([TANK_SYMBOL] * tanks + [HEAL_SYMBOL] * heals
+             + [SCORPION_SYMBOL] * scorpions + [FIREFLY_SYMBOL] * fireflies)
+    if buildings + len(units) > free_tiles:
+        raise ValueError(f"only {free_tiles} free tiles for {buildings} "
+                         f"buildings and {len(units)} units")
+
+    def take_free_tile() -> tuple[int, int]:
+        # rejection sampling keeps placement cheap on very large boards
+        while True:
+            row, col = rng.randrange(1, rows - 1), rng.randrange(1, cols - 1)
+            if board[row][col] == ground:
+                return row, col
+
+    for _ in range(buildings):
+        row, col = take_free_tile()
+        board[row][col] = ord(str(rng.randint(1, MAX_BUILDING_HEALTH)))
+
+    occupied = set()
+    unit_lines = []
+    for symbol in units:
+        position = take_free_tile()
+        while position in occupied:
+            position = take_free_tile()
+        occupied.add(position)
+        health, speed, strength = (rng.randint(low, high)
+                                   for low, high in UNIT_STATS[symbol])
+        unit_lines.append(f"{symbol},{position[0]},{position[1]},"
+                          f"{health},{speed},{strength}")
+
+    for board_row in board:
+        yield board_row.decode("ascii")
+    yield ""
+    yield from unit_lines
+
+
+def write_level(file_path: str, rows: int, cols: int, **settings) -> None:
+    """
+    Writes a random level to a file, one line at a time.
+
+    Parameters:
+        file_path: path of the game file to write.
+        rows: number of board rows.
+        cols: number of board columns.
+        **settings: any other argument of generate_level.
+    """
+    with open(file_path, "w") as level_file:
+        for line in generate_level(rows, cols, **settings):
+            level_file.write(line + "\n")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Generate a random Into The Breach level.")
+    parser.add_argument("output", help="game file to write")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mountain-density", type=float,
+                        default=DEFAULT_MOUNTAIN_DENSITY)
+    parser.add_argument("--buildings", type=int, default=4)
+    parser.add_argument("--tanks", type=int, default=2)
+    parser.add_argument("--heals", type=int, default=1)
+    parser.add_argument("--scorpions", type=int, default=2)
+    parser.add_argument("--fireflies", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    write_level(args.output, args.rows, args.cols, seed=args.seed,
+                mountain_density=args.mountain_density,
+                buildings=args.buildings, tanks=args.tanks, heals=args.heals,
+                scorpions=args.scorpions, fireflies=args.fireflies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Headless replay of Into The Breach action journals.
+
+Loads a journal written by BreachModel.start_journal and replays it with
+BreachModel alone, as fast as the model runs, checking every recorded end of
+turn and checkpoint against the replayed game. A game that replays
+differently from how it was played is reported with the record where it
+first diverged, which makes bugs seen while playing reproducible.
+
+Example:
+    python replay.py game.itbj --turn 12 --save turn12.breach
+"""
+import argparse
+import sys
+import time
+from typing import Optional
+
+from a2 import load_journal, save_breach_model
+from a2_support import (JOURNAL_CHECKPOINT, JOURNAL_END_TURN, JOURNAL_MOVE,
+                        JOURNAL_UNDO, read_journal)
+
+WIN = "win"
+LOSS = "loss"
+IN_PROGRESS = "in progress"
+
+
+def replay_journal(journal_file: str,
+                   turn: Optional[int] = None,
+                   replay_all: bool = True) -> dict:
+    """
+    Replays a journal up to the start of a turn, or to its end.
+
+    Parameters:
+        journal_file: path of the journal to replay.
+        turn: the turn to stop at the start of, or None to replay everything.
+        replay_all: whether to replay from the first checkpoint, checking
+                    every later one, rather than resume from the nearest.
+
+    Returns:
+        A dictionary of the record counts, the replay time, the outcome
+        and the replayed game, under "model".
+
+    Raises:
+        ValueError: if the journal is malformed or replays differently.
+    """
+    with open(journal_file, "rb") as journal:
+        records = read_journal(journal.read())
+    counts = {kind: 0 for kind in (JOURNAL_CHECKPOINT, JOURNAL_MOVE,
+                                   JOURNAL_END_TURN, JOURNAL_UNDO)}
+    for kind, _ in records:
+        counts[kind] += 1
+
+    start = time.perf_counter()
+    model = load_journal(journal_file, turn, replay_all)
+    elapsed = time.perf_counter() - start
+
+    # the controller checks for a win before a loss
+    outcome = IN_PROGRESS
+    if model.has_won():
+        outcome = WIN
+    elif model.has_lost():
+        outcome = LOSS
+    return {
+        "journal": journal_file,
+        "records": len(records),
+        "checkpoints": counts[JOURNAL_CHECKPOINT],
+        "moves": counts[JOURNAL_MOVE],
+        "turns": counts[JOURNAL_END_TURN],
+        "undos": counts[JOURNAL_UNDO],
+        "outcome": outcome,
+        "seconds": elapsed,
+        "model": model,
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Returns a human readable summary of a report from replay_journal.
+    """
+    return "\n".join([
+        f"journal:     {report['journal']}",
+        f"records:     {report['records']} ({report['checkpoints']} "
+        f"checkpoint(s), {report['moves']} move(s), {report['turns']} "
+        f"end(s) of turn, {report['undos']} undo(s))",
+        f"outcome:     {report['outcome']}",
+        f"time:        {report['seconds']:.3f}s",
+    ])
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point. Returns 1 if the journal fails to replay."""
+    parser = argparse.ArgumentParser(
+        description="Replay an Into The Breach action journal.")
+    parser.add_argument("journal", help="journal file to replay")
+    parser.add_argument("--turn", type=int, default=None,
+                        help="stop at the start of this turn "
+                             "(default: replay everything)")
+    parser.add_argument("--resume", action="store_true",
+                        help="replay from the nearest checkpoint only, "
+                             "instead of checking the whole game")
+    parser.add_argument("--save", metavar="PATH",
+                        help="save the replayed game state here")
+    args = parser.parse_args(argv)
+
+    try:
+        report = replay_journal(args.journal, args.turn, not args.resume)
+    except ValueError as error:
+        print(f"replay failed: {error}", file=sys.stderr)
+        return 1
+    print(format_report(report))
+    if args.save:
+        save_breach_model(report["model"], args.save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Headless batch simulation of Into The Breach games.
+
+Plays many games of a level to completion using only BreachModel, so that
+levels can be tuned on machines without a display. Each game is driven by a
+mech policy: a function that makes the player's moves for one turn.
+
+Example:
+    python simulate.py levels/level1.txt --games 1000 --policy random
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+from a2 import BreachModel, Entity, load_breach_model
+from a2_support import JOURNAL_EXTENSION
+
+WIN = "win"
+LOSS = "loss"
+UNFINISHED = "unfinished"
+
+DEFAULT_MAX_TURNS = 50
+
+# A mech policy makes every mech move for one turn, using attempt_move
+MechPolicy = Callable[[BreachModel, random.Random], None]
+
+
+class GameResult(NamedTuple):
+    """The outcome of one simulated game."""
+    outcome: str
+    turns: int
+
+
+def idle_policy(model: BreachModel, rng: random.Random) -> None:
+    """
+    Never moves any mech.
+
+    Parameters:
+        model: the game being played.
+        rng: source of randomness for this game.
+    """
+
+
+def random_policy(model: BreachModel, rng: random.Random) -> None:
+    """
+    Moves every active mech to a random valid position,
+    or leaves it where it is.
+
+    Parameters:
+        model: the game being played.
+        rng: source of randomness for this game.
+    """
+    for entity in list(model.get_entities()):
+        if entity.is_friendly() and entity.is_alive() and entity.is_active():
+            positions = model.get_valid_movement_positions(entity)
+            choice = rng.randrange(len(positions) + 1)
+            if choice < len(positions):
+                model.attempt_move(entity, positions[choice])
+
+
+def _count_enemy_targets(model: BreachModel,
+                         entity: Entity,
+                         position: tuple[int, int]) -> int:
+    """
+    Returns how many live enemies the entity would target
+    if it stood at the given position.
+    """
+    row, col = entity.get_position()
+    count = 0
+    for target_row, target_col in entity.get_targets():
+        target = model.get_entity_at((target_row - row + position[0],
+                                      target_col - col + position[1]))
+        if (target is not None and not target.is_friendly()
+            and target.is_alive()):
+            count += 1
+    return count
+
+
+def aggressive_policy(model: BreachModel, rng: random.Random) -> None:
+    """
+    Moves every active mech to the valid position from which it targets
+    the most enemies, breaking ties at random. Heal mechs are moved at random.
+
+    Parameters:
+        model: the game being played.
+        rng: source of randomness for this game.
+    """
+    for entity in list(model.get_entities()):
+        if not (entity.is_friendly() and entity.is_alive()
+                and entity.is_active()):
+            continue
+        positions = model.get_valid_movement_positions(entity)
+        if entity.get_strength() < 0:
+            if positions:
+                model.attempt_move(entity, rng.choice(positions))
+            continue
+        best_score = _count_enemy_targets(model, entity, entity.get_position())
+        best_positions = []
+        for position in positions:
+            score = _count_enemy_targets(model, entity, position)
+            if score > best_score:
+                best_score = score
+                best_positions = [position]
+            elif score == best_score and score > 0:
+                best_positions.append(position)
+        if best_positions:
+            model.attempt_move(entity, rng.choice(best_positions))
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "random": random_policy,
+    "aggressive": aggressive_policy,
+}
+
+
+def simulate_game(model: BreachModel,
+                  policy: MechPolicy,
+                  rng: random.Random,
+                  max_turns: int = DEFAULT_MAX_TURNS) -> GameResult:
+    """
+    Plays one game to completion, or until max_turns turns have ended.
+
+    Parameters:
+        model: the starting state of the game, which is played in place.
+        policy: makes the mech moves for each turn.
+        rng: source of randomness passed to the policy.
+        max_turns: number of turns after which the game is abandoned.
+    """
+    for turn in range(1, max_turns + 1):
+        policy(model, rng)
+        model.end_turn()
+        # the controller checks for a win before a loss
+        if model.has_won():
+            return GameResult(WIN, turn)
+        if model.has_lost():
+            return GameResult(LOSS, turn)
+    return GameResult(UNFINISHED, max_turns)
+
+
+def _simulate_games(level_file: str,
+                    policy_name: str,
+                    seeds: list[int],
+                    max_turns: int,
+                    journal_dir: Optional[str] = None) -> list[GameResult]:
+    """
+    Plays one game of the level per seed. Runs in worker processes,
+    so the policy is passed by name. Each game is journaled to its own file
+    in journal_dir, named after its seed, if journal_dir is given.
+    """
+    policy = POLICIES[policy_name]
+    results = []
+    for seed in seeds:
+        model = load_breach_model(level_file)
+        if journal_dir is not None:
+            model.start_journal(os.path.join(journal_dir,
+                                             f"game{seed}{JOURNAL_EXTENSION}"))
+        results.append(simulate_game(model, policy, random.Random(seed),
+                                     max_turns))
+        model.stop_journal()
+    return results
+
+
+def run_batch(level_file: str,
+              policy_name: str = "random",
+              games: int = 100,
+              seed: int = 0,
+              max_turns: int = DEFAULT_MAX_TURNS,
+              workers: Optional[int] = None,
+              journal_dir: Optional[str] = None) -> dict:
+    """
+    Plays a batch of games of a level and reports throughput and outcomes.
+    Game i uses seed + i, so a batch always has the same results
+    however it is split between processes.
+
+    Parameters:
+        level_file: path of the game file to play.
+        policy_name: key of the mech policy in POLICIES.
+        games: number of games to play.
+        seed: seed of the first game.
+        max_turns: number of turns after which a game is abandoned.
+        workers: number of worker processes, or None to play every game
+                 in this process.
+        journal_dir: directory to write an action journal of each game to,
+                     for replay.py, or None to write no journals.
+
+    Returns:
+        A dictionary of the batch settings, outcome counts, win rate,
+        and games and turns played per second.
+    """
+    if policy_name not in POLICIES:
+        raise ValueError(f"unknown policy {policy_name!r}, "
+                         f"expected one of {sorted(POLICIES)}")
+    seeds = list(range(seed, seed + games))
+    start = time.perf_counter()
+    if workers is None or workers <= 1:
+        results = _simulate_games(level_file, policy_name, seeds, max_turns,
+                                  journal_dir)
+    else:
+        chunks = [seeds[index::workers] for index in range(workers)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(_simulate_games,
+                                              [level_file] * workers,
+                                              [policy_name] * workers,
+                                              chunks,
+                                              [max_turns] * workers,
+                                              [journal_dir] * workers):
+                results.extend(chunk_results)
+    elapsed = time.perf_counter() - start
+
+    turns = sum(result.turns for result in results)
+    outcomes = {WIN: 0, LOSS: 0, UNFINISHED: 0}
+    for result in results:
+        outcomes[result.outcome] += 1
+    return {
+        "level": level_file,
+        "policy": policy_name,
+        "games": games,
+        "workers": workers or 1,
+        "wins": outcomes[WIN],
+        "losses": outcomes[LOSS],
+        "unfinished": outcomes[UNFINISHED],
+        "win_rate": outcomes[WIN] / games if games else 0.0,
+        "turns": turns,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "turns_per_second": turns / elapsed if elapsed else 0.0,
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Returns a human readable summary of a report from run_batch.
+    """
+    return "\n".join([
+        f"level:      {report['level']}",
+        f"policy:     {report['policy']}",
+        f"games:      {report['games']} ({report['workers']} worker(s))",
+        f"outcomes:   {report['wins']} won, {report['losses']} lost, "
+        f"{report['unfinished']} unfinished",
+        f"win rate:   {report['win_rate']:.1%}",
+        f"time:       {report['seconds']:.3f}s",
+        f"games/sec:  {report['games_per_second']:.1f}",
+        f"turns/sec:  {report['turns_per_second']:.1f}",
+    ])
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Play Into The Breach games without a display.")
+    parser.add_argument("level", help="game file to play")
+    parser.add_argument("--games", type=int, default=100,
+                        help="number of games to play (default: 100)")
+    parser.add_argument("--policy", choices=sorted(POLICIES),
+                        default="random",
+                        help="mech policy (default: random)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game (default: 0)")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS,
+                        help="turns before a game is abandoned "
+                             f"(default: {DEFAULT_MAX_TURNS})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: play in-process)")
+    parser.add_argument("--journal", metavar="DIR", default=None,
+                        help="write an action journal of each game here")
+    args = parser.parse_args(argv)
+
+    print(format_report(run_batch(args.level, args.policy, args.games,
+                                  args.seed, args.max_turns, args.workers,
+                                  args.journal)))
+
+
+if __name__ == "__main__":
+    main()